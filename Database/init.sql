@@ -91,6 +91,7 @@ CREATE INDEX idx_mails_goal ON mails(related_goal_id);
 CREATE INDEX idx_mails_enabled ON mails(enabled);
 CREATE INDEX idx_mails_sent_when ON mails(sent_when);
 CREATE INDEX idx_mails_status ON mails(status);
+CREATE UNIQUE INDEX uq_mails_owner_goal_settings ON mails(owner_user_id, related_goal_id) WHERE status = 'scheduled';
 
 GRANT SELECT, INSERT, UPDATE, DELETE ON mails TO mail_service;
 
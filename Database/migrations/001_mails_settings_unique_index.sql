@@ -0,0 +1,29 @@
+-- =====================================================
+-- MAILER SERVICE: UNIQUE EMAIL SETTINGS PER GOAL
+-- =====================================================
+-- Adds the partial unique index the email settings upsert relies on to a
+-- trackify_mail database created before it was part of init.sql.
+-- Duplicate scheduled settings rows are removed first, keeping the most
+-- recently updated row per (owner, goal); ties go to the larger mail_id.
+--
+-- Run once as the owner of the mails table, e.g.:
+--   docker compose exec -T database psql -U postgres -d trackify_mail < Database/migrations/001_mails_settings_unique_index.sql
+
+BEGIN;
+
+DELETE FROM mails
+WHERE status = 'scheduled'
+  AND EXISTS (
+    SELECT 1 FROM mails AS newer
+    WHERE newer.status = 'scheduled'
+      AND newer.owner_user_id = mails.owner_user_id
+      AND newer.related_goal_id = mails.related_goal_id
+      AND (
+        newer.updated_at > mails.updated_at
+        OR (newer.updated_at = mails.updated_at AND newer.mail_id > mails.mail_id)
+      )
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mails_owner_goal_settings ON mails(owner_user_id, related_goal_id) WHERE status = 'scheduled';
+
+COMMIT;
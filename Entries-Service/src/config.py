@@ -5,7 +5,8 @@ from dotenv import load_dotenv
 
 ENV = os.getenv("ENV", "prod")
 
-if ENV == "dev" or ENV == "prod":
+# In prod the environment normally provides the secrets; the .env baked into the image is the fallback
+if (ENV == "dev" or (ENV == "prod" and not os.getenv("SECRET_KEY"))) and os.path.isfile(".env"):
     load_dotenv(".env")
 
 # Database Configuration
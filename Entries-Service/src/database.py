@@ -15,8 +15,8 @@ class TimeEntry(Base):
     __tablename__ = "time_entries"
 
     entry_id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    owner_user_id = Column(Text, nullable=False, index=True) 
-    related_goal_id = Column(PG_UUID(as_uuid=True), nullable=True, index=True)
+    owner_user_id = Column(Text, nullable=False) 
+    related_goal_id = Column(PG_UUID(as_uuid=True), nullable=True)
     work_date = Column(Date, nullable=True)  
     start_time = Column(Time, nullable=True)  
     end_time = Column(Time, nullable=True)  
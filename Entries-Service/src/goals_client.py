@@ -1,42 +1,62 @@
 """Goals Service Client for validating goals"""
 
 import httpx
+from typing import Optional
 from uuid import UUID
 from config import GOALS_SERVICE_URL
 from fastapi import HTTPException, status
 
+_client: Optional[httpx.AsyncClient] = None
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared Goals Service client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=GOALS_SERVICE_URL,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+    return _client
+
+async def close_client() -> None:
+    """Close the shared Goals Service client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 async def validate_goal_ownership(goal_id: UUID, token: str) -> bool:
     """
     Validate that a goal belongs to the current user
-    
+
     Args:
         goal_id: ID of the goal
         token: JWT token for authentication
-    
+
     Returns:
         True if goal belongs to user, False otherwise
-    
+
     Raises:
         HTTPException: If request fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GOALS_SERVICE_URL}/api/goals/{goal_id}",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
+        client = get_client()
+        response = await client.get(
+            f"/api/goals/{goal_id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        if response.status_code == 200:
+            return True
+        elif response.status_code == 404:
+            return False
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Goals Service error: {response.status_code}"
             )
-            
-            if response.status_code == 200:
-                return True
-            elif response.status_code == 404:
-                return False
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Goals Service error: {response.status_code}"
-                )
-    
+
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -39,7 +39,7 @@ from schemas import (
     HealthResponse
 )
 
-from goals_client import validate_goal_ownership
+from goals_client import validate_goal_ownership, close_client as close_goals_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -88,6 +88,11 @@ def startup_event():
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared service client on application shutdown"""
+    await close_goals_client()
+
 # =====================================================
 # HEALTH CHECK ENDPOINTS
 # =====================================================
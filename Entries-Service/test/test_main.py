@@ -63,7 +63,7 @@ def reset_db():
     Base.metadata.drop_all(bind=engine)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user():
     """Create test user credentials"""
     user_id = "test_google_sub_12345"
@@ -71,7 +71,7 @@ def test_user():
     return {"user_id": user_id, "token": token}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_goal_id():
     """Create test goal ID"""
     return uuid4()
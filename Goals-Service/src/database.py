@@ -15,7 +15,7 @@ class Goal(Base):
     __tablename__ = "goals"
 
     goal_id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    owner_user_id = Column(Text, nullable=False, index=True)  
+    owner_user_id = Column(Text, nullable=False)  
     title = Column(Text, nullable=False)
     target_hours = Column(Numeric, nullable=True)  
     start_date = Column(Date, nullable=True)
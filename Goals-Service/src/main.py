@@ -33,7 +33,7 @@ from schemas import (
     HealthResponse
 )
 
-from entries_client import get_goal_total_hours, get_goal_entries_count
+from entries_client import get_goal_total_hours, get_goal_entries_count, close_client as close_entries_client
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -82,6 +82,11 @@ def startup_event():
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared service client on application shutdown"""
+    await close_entries_client()
+
 # =====================================================
 # HEALTH CHECK ENDPOINTS
 # =====================================================
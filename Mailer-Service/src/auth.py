@@ -2,13 +2,17 @@
 
 import jwt
 import httpx
+import time
+from cachetools import TTLCache
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from config import SECRET_KEY, ALGORITHM, USER_SERVICE_URL
+from config import SECRET_KEY, ALGORITHM, USER_SERVICE_URL, TOKEN_CACHE_TTL
 
 security = HTTPBearer()
 
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+
 def create_access_token(user_id: str, expires_delta: timedelta = None) -> str:
     """Create JWT access token for testing purposes"""
     if expires_delta:
@@ -24,7 +28,14 @@ def verify_token(token: str) -> str:
     """
     Verify JWT token and return user_id
     This token comes from the User Service
+    Decoded tokens are cached for TOKEN_CACHE_TTL seconds, never past their expiry
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at is None or time.time() < expires_at:
+            return user_id
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -34,6 +45,7 @@ def verify_token(token: str) -> str:
                 detail="Invalid token: missing user_id",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        _token_cache[token] = (user_id, payload.get("exp"))
         return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(
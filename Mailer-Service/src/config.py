@@ -5,7 +5,8 @@ from dotenv import load_dotenv
 
 ENV = os.getenv("ENV", "prod")
 
-if ENV == "dev" or ENV == "prod":
+# In prod the environment normally provides the secrets; the .env baked into the image is the fallback
+if (ENV == "dev" or (ENV == "prod" and not os.getenv("SECRET_KEY"))) and os.path.isfile(".env"):
     load_dotenv(".env")
 
 # Database Configuration
@@ -19,6 +20,7 @@ POSTGRES_DB = os.getenv("POSTGRES_DB", "trackify_mail")
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "30"))
 
 # AWS SES Configuration
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
@@ -32,6 +34,11 @@ USER_SERVICE_URL = os.getenv("USER_SERVICE_URL", "http://user-service:80")
 PDF_SERVICE_URL = os.getenv("PDF_SERVICE_URL", "http://pdf-service:80")
 ENTRIES_SERVICE_URL = os.getenv("ENTRIES_SERVICE_URL", "http://entries-service:80")
 
+# Cache Configuration
+REDIS_URL = os.getenv("REDIS_URL")
+PDF_CACHE_TTL = int(os.getenv("PDF_CACHE_TTL", str(32 * 24 * 3600)))  # 0 disables goal PDF caching
+PDF_REPORT_CACHE_TTL = int(os.getenv("PDF_REPORT_CACHE_TTL", "600"))  # 0 disables report caching
+
 # Server Configuration
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8002"))
@@ -1,6 +1,6 @@
 """Database configuration and models for Mailer Service"""
 
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Numeric, Index, Boolean
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Numeric, Index, Boolean, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import declarative_base, sessionmaker
 from datetime import datetime, timezone
@@ -15,8 +15,8 @@ class Mail(Base):
     __tablename__ = "mails"
 
     mail_id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    owner_user_id = Column(Text, nullable=False, index=True)
-    related_goal_id = Column(PG_UUID(as_uuid=True), nullable=True, index=True)
+    owner_user_id = Column(Text, nullable=False)
+    related_goal_id = Column(PG_UUID(as_uuid=True), nullable=True)
     recipient = Column(Text, nullable=False)
     subject = Column(Text, nullable=True)
     body = Column(Text, nullable=True)
@@ -36,6 +36,14 @@ class Mail(Base):
         Index('idx_mails_status', 'status'),
         Index('idx_mails_enabled', 'enabled'),
         Index('idx_mails_sent_when', 'sent_when'),
+        Index(
+            'uq_mails_owner_goal_settings',
+            'owner_user_id',
+            'related_goal_id',
+            unique=True,
+            postgresql_where=text("status = 'scheduled'"),
+            sqlite_where=text("status = 'scheduled'")
+        ),
     )
 
 def get_db():
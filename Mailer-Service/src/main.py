@@ -5,8 +5,11 @@ A FastAPI based mailer service for sending scheduled monthly reports.
 
 from fastapi import FastAPI, HTTPException, Depends, status, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import select, bindparam, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import SQLAlchemyError
+from pydantic import TypeAdapter
 from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
 from uuid import UUID
@@ -33,6 +36,7 @@ from schemas import (
     MailCreate,
     MailUpdate,
     MailResponse,
+    MailListItem,
     MailListResponse,
     SendMailRequest,
     SendMailResponse,
@@ -43,13 +47,35 @@ from schemas import (
     SendNowRequest
 )
 
-from ses_client import send_email
-from pdf_client import generate_report_pdf, fetch_pdf_from_service
+from ses_client import send_email, send_bulk_emails, close_client as close_ses_client
+from pdf_client import generate_report_pdf, fetch_pdf_from_service, close_client as close_pdf_client, PDF_FETCH_CONCURRENCY
 import httpx
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_MAIL_LIST_ADAPTER = TypeAdapter(list[MailListItem])
+
+COMMON_ERRORS = {
+    401: {"description": "Unauthorized"},
+    500: {"description": "Internal server error"}
+}
+
+SETTINGS_ERRORS = {
+    **COMMON_ERRORS,
+    404: {"description": "Email settings not found for this goal"}
+}
+
+def get_owned_mail(db: Session, mail_id: UUID, owner_user_id: str):
+    """
+    Fetch a mail by primary key if it belongs to the given user.
+    Session.get checks the identity map before issuing a SELECT.
+    """
+    mail = db.get(Mail, mail_id)
+    if mail is None or mail.owner_user_id != owner_user_id:
+        return None
+    return mail
+
 app = FastAPI(
     title="Mailer Service",
     description="""Email sending microservice for Trackify with Amazon SES integration.
@@ -230,32 +256,48 @@ async def send_scheduled_emails():
                     ).all()
                     logger.info(f"Found {len(settings_to_send)} emails to send today (day {current_day})")
                 
+                due_settings = []
                 for setting in settings_to_send:
                     if setting.last_sent_at:
                         last_sent = setting.last_sent_at.replace(tzinfo=timezone.utc)
                         if last_sent.month == today.month and last_sent.year == today.year:
                             logger.info(f"Email for goal {setting.goal_id} already sent this month")
                             continue
-                    
-                    try:
-                        token = "system_token"  
-                        subject, body, pdf_data = await generate_monthly_report_email(
+                    due_settings.append(setting)
+                
+                token = "system_token"  
+                semaphore = asyncio.Semaphore(PDF_FETCH_CONCURRENCY)
+                
+                async def prepare_report(setting):
+                    async with semaphore:
+                        return await generate_monthly_report_email(
                             setting.related_goal_id,
                             setting.recipient,
                             setting.owner_user_id,
                             token
                         )
+                
+                reports = await asyncio.gather(
+                    *(prepare_report(setting) for setting in due_settings),
+                    return_exceptions=True
+                )
+                
+                for setting, report in zip(due_settings, reports):
+                    try:
+                        if isinstance(report, Exception):
+                            raise report
+                        subject, body, pdf_data = report
                         
-                        message_id = send_email(
+                        message_id = await send_email(
                             recipient=setting.recipient,
                             subject=subject,
                             body=body,
                             pdf_attachment=pdf_data,
-                            pdf_filename=f"report_{datetime.now().strftime('%Y_%m')}.pdf"
+                            pdf_filename=f"report_{today.strftime('%Y_%m')}.pdf"
                         )
                         
-                        setting.last_sent_at = datetime.now(timezone.utc)
-                        setting.updated_at = datetime.now(timezone.utc)
+                        setting.last_sent_at = today
+                        setting.updated_at = today
                         db.commit()
                         
                         logger.info(f"Scheduled email sent for goal {setting.related_goal_id}, MessageId: {message_id}")
@@ -285,10 +327,13 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Stop scheduler on shutdown"""
+    """Stop scheduler and close shared PDF Service and SES clients on shutdown"""
     global scheduler_running
     scheduler_running = False
     logger.info("Email scheduler stopped")
+    
+    await close_pdf_client()
+    await close_ses_client()
 
 # ============================================================================
 # HEALTH CHECK ENDPOINTS
@@ -341,8 +386,7 @@ async def readiness():
                 }
             }
         },
-        401: {"description": "Unauthorized"},
-        500: {"description": "Internal server error"}
+        **COMMON_ERRORS
     }
 )
 async def create_mail(
@@ -398,7 +442,7 @@ async def create_mail(
         db.refresh(mail)
         
         logger.info(f"Mail created: {mail.mail_id}")
-        return MailResponse.from_orm(mail)
+        return MailResponse.model_validate(mail)
     
     except SQLAlchemyError as e:
         db.rollback()
@@ -420,7 +464,21 @@ async def list_mails(
     List mails for current user with pagination
     """
     try:
-        query = db.query(Mail).filter(Mail.owner_user_id == current_user)
+        query = db.query(Mail).options(
+            load_only(
+                Mail.mail_id,
+                Mail.owner_user_id,
+                Mail.related_goal_id,
+                Mail.recipient,
+                Mail.subject,
+                Mail.pdf_url,
+                Mail.status,
+                Mail.sent_when,
+                Mail.created_at,
+                Mail.sent_at,
+                Mail.updated_at
+            )
+        ).filter(Mail.owner_user_id == current_user)
         
         if status_filter:
             query = query.filter(Mail.status == status_filter)
@@ -429,7 +487,7 @@ async def list_mails(
         mails = query.offset((page - 1) * page_size).limit(page_size).all()
         
         return {
-            "mails": [MailResponse.from_orm(mail) for mail in mails],
+            "mails": _MAIL_LIST_ADAPTER.validate_python(mails, from_attributes=True),
             "total": total,
             "page": page,
             "page_size": page_size
@@ -451,10 +509,7 @@ async def get_mail(
     """
     Get a specific mail by ID
     """
-    mail = db.query(Mail).filter(
-        Mail.mail_id == mail_id,
-        Mail.owner_user_id == current_user
-    ).first()
+    mail = get_owned_mail(db, mail_id, current_user)
     
     if not mail:
         raise HTTPException(
@@ -462,7 +517,7 @@ async def get_mail(
             detail="Mail not found"
         )
     
-    return MailResponse.from_orm(mail)
+    return MailResponse.model_validate(mail)
 
 @app.put("/api/mail/{mail_id}", response_model=MailResponse)
 async def update_mail(
@@ -474,10 +529,7 @@ async def update_mail(
     """
     Update a mail record (only if not sent)
     """
-    mail = db.query(Mail).filter(
-        Mail.mail_id == mail_id,
-        Mail.owner_user_id == current_user
-    ).first()
+    mail = get_owned_mail(db, mail_id, current_user)
     
     if not mail:
         raise HTTPException(
@@ -506,7 +558,7 @@ async def update_mail(
         db.refresh(mail)
         
         logger.info(f"Mail updated: {mail_id}")
-        return MailResponse.from_orm(mail)
+        return MailResponse.model_validate(mail)
     
     except SQLAlchemyError as e:
         db.rollback()
@@ -525,10 +577,7 @@ async def delete_mail(
     """
     Delete a mail record (only if not sent)
     """
-    mail = db.query(Mail).filter(
-        Mail.mail_id == mail_id,
-        Mail.owner_user_id == current_user
-    ).first()
+    mail = get_owned_mail(db, mail_id, current_user)
     
     if not mail:
         raise HTTPException(
@@ -581,8 +630,7 @@ async def delete_mail(
                 }
             }
         },
-        401: {"description": "Unauthorized"},
-        500: {"description": "Internal server error"}
+        **COMMON_ERRORS
     }
 )
 async def create_email_settings(
@@ -614,38 +662,37 @@ async def create_email_settings(
     **Authentication**: Required (Bearer token)
     """
     try:
-        existing = db.query(Mail).filter(
-            Mail.related_goal_id == settings_data.goal_id,
-            Mail.owner_user_id == current_user
-        ).first()
-        
-        if existing:
-            existing.recipient = settings_data.recipient_email
-            existing.enabled = settings_data.enabled
-            existing.sent_when = settings_data.send_day
-            existing.updated_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(existing)
-            logger.info(f"Email settings updated for goal: {settings_data.goal_id}")
-            return EmailSettingsResponse.from_orm(existing)
-        
-        mail = Mail(
+        now = datetime.now(timezone.utc)
+        stmt = pg_insert(Mail).values(
             owner_user_id=current_user,
             related_goal_id=settings_data.goal_id,
             recipient=settings_data.recipient_email,
-            subject="Monthly Progress Report", 
-            body="",  
+            subject="Monthly Progress Report",
+            body="",
             enabled=settings_data.enabled,
             sent_when=settings_data.send_day,
-            status="scheduled"
-        )
+            status="scheduled",
+            created_at=now,
+            updated_at=now
+        ).on_conflict_do_update(
+            index_elements=["owner_user_id", "related_goal_id"],
+            index_where=text("status = 'scheduled'"),
+            set_={
+                "recipient": settings_data.recipient_email,
+                "enabled": settings_data.enabled,
+                "sent_when": settings_data.send_day,
+                "updated_at": now
+            }
+        ).returning(Mail)
         
-        db.add(mail)
+        settings = db.execute(
+            stmt,
+            execution_options={"populate_existing": True}
+        ).scalar_one()
         db.commit()
-        db.refresh(mail)
         
-        logger.info(f"Email settings created for goal: {settings_data.goal_id}")
-        return EmailSettingsResponse.from_orm(mail)
+        logger.info(f"Email settings saved for goal: {settings_data.goal_id}")
+        return EmailSettingsResponse.model_validate(settings)
     
     except SQLAlchemyError as e:
         db.rollback()
@@ -662,9 +709,7 @@ async def create_email_settings(
     summary="Get Email Settings",
     responses={
         200: {"description": "Email settings retrieved successfully"},
-        401: {"description": "Unauthorized"},
-        404: {"description": "Email settings not found for this goal"},
-        500: {"description": "Internal server error"}
+        **SETTINGS_ERRORS
     }
 )
 async def get_email_settings(
@@ -696,7 +741,7 @@ async def get_email_settings(
             detail="Email settings not found for this goal"
         )
     
-    return EmailSettingsResponse.from_orm(settings)
+    return EmailSettingsResponse.model_validate(settings)
 
 @app.put(
     "/api/mail/settings/{goal_id}",
@@ -705,9 +750,7 @@ async def get_email_settings(
     summary="Update Email Settings",
     responses={
         200: {"description": "Email settings updated successfully"},
-        401: {"description": "Unauthorized"},
-        404: {"description": "Email settings not found"},
-        500: {"description": "Internal server error"}
+        **SETTINGS_ERRORS
     }
 )
 async def update_email_settings(
@@ -757,7 +800,7 @@ async def update_email_settings(
         db.refresh(settings)
         
         logger.info(f"Email settings updated for goal: {goal_id}")
-        return EmailSettingsResponse.from_orm(settings)
+        return EmailSettingsResponse.model_validate(settings)
     
     except SQLAlchemyError as e:
         db.rollback()
@@ -774,9 +817,7 @@ async def update_email_settings(
     summary="Delete Email Settings",
     responses={
         204: {"description": "Email settings deleted successfully"},
-        401: {"description": "Unauthorized"},
-        404: {"description": "Email settings not found"},
-        500: {"description": "Internal server error"}
+        **SETTINGS_ERRORS
     }
 )
 async def delete_email_settings(
@@ -846,8 +887,7 @@ async def delete_email_settings(
                 }
             }
         },
-        401: {"description": "Unauthorized"},
-        404: {"description": "Email settings not found for this goal"},
+        **SETTINGS_ERRORS,
         500: {"description": "Failed to send email"}
     }
 )
@@ -883,6 +923,7 @@ async def send_now(
     **Authentication**: Required (Bearer token)
     """
     current_user, token = user_with_token
+    now = datetime.now(timezone.utc)
     
     settings = db.query(Mail).filter(
         Mail.related_goal_id == request.goal_id,
@@ -903,16 +944,16 @@ async def send_now(
             token
         )
         
-        message_id = send_email(
+        message_id = await send_email(
             recipient=settings.recipient,
             subject=subject,
             body=body,
             pdf_attachment=pdf_data,
-            pdf_filename=f"report_{datetime.now(timezone.utc).strftime('%Y_%m')}.pdf"
+            pdf_filename=f"report_{now.strftime('%Y_%m')}.pdf"
         )
         
-        settings.last_sent_at = datetime.now(timezone.utc)
-        settings.updated_at = datetime.now(timezone.utc)
+        settings.last_sent_at = now
+        settings.updated_at = now
         db.commit()
         
         logger.info(f"Immediate email sent for goal {request.goal_id}, MessageId: {message_id}")
@@ -921,7 +962,7 @@ async def send_now(
             mail_id=request.goal_id,  
             status="sent",
             message=f"Report email sent successfully to {settings.recipient}",
-            sent_at=datetime.now(timezone.utc)
+            sent_at=now
         )
     
     except HTTPException:
@@ -938,7 +979,7 @@ async def send_now(
 # =====================================================
 
 @app.post(
-    "/api/mail/{mail_id}/send",
+    "/api/mail/{mail_id:uuid}/send",
     response_model=SendMailResponse,
     tags=["Email Sending"],
     summary="Send Mail by ID",
@@ -957,8 +998,8 @@ async def send_now(
                 }
             }
         },
+        **COMMON_ERRORS,
         400: {"description": "Mail already sent"},
-        401: {"description": "Unauthorized"},
         404: {"description": "Mail not found"},
         500: {"description": "Failed to send via SES"}
     }
@@ -988,10 +1029,8 @@ async def send_mail(
     
     **Authentication**: Required (Bearer token)
     """
-    mail = db.query(Mail).filter(
-        Mail.mail_id == mail_id,
-        Mail.owner_user_id == current_user
-    ).first()
+    now = datetime.now(timezone.utc)
+    mail = get_owned_mail(db, mail_id, current_user)
     
     if not mail:
         raise HTTPException(
@@ -1006,15 +1045,15 @@ async def send_mail(
         )
     
     try:
-        message_id = send_email(
+        message_id = await send_email(
             recipient=mail.recipient,
             subject=mail.subject,
             body=mail.body
         )
         
         mail.status = "sent"
-        mail.sent_at = datetime.now(timezone.utc)
-        mail.updated_at = datetime.now(timezone.utc)
+        mail.sent_at = now
+        mail.updated_at = now
         db.commit()
         db.refresh(mail)
         
@@ -1030,7 +1069,7 @@ async def send_mail(
     except HTTPException as e:
         mail.status = "failed"
         mail.error_message = e.detail
-        mail.updated_at = datetime.now(timezone.utc)
+        mail.updated_at = now
         db.commit()
         
         logger.error(f"Failed to send mail {mail_id}: {e.detail}")
@@ -1072,8 +1111,7 @@ async def send_mail(
                 }
             }
         },
-        401: {"description": "Unauthorized"},
-        500: {"description": "Internal server error"}
+        **COMMON_ERRORS
     }
 )
 async def send_batch_mails(
@@ -1085,8 +1123,10 @@ async def send_batch_mails(
     Send multiple mail records in a single batch operation.
     
     **Batch Processing**:
-    - Processes each mail ID sequentially
+    - Loads all requested mails in one query
+    - Sends through SES bulk templated email, up to 50 mails per API call
     - Continues on individual failures
+    - Records sent statuses in a single commit
     - Returns detailed status for each mail
     
     **Result Status Types**:
@@ -1106,53 +1146,79 @@ async def send_batch_mails(
     **Authentication**: Required (Bearer token)
     """
     results = []
-    
-    for mail_id in mail_ids:
-        try:
-            mail = db.query(Mail).filter(
-                Mail.mail_id == mail_id,
+    mails = {
+        mail.mail_id: mail
+        for mail in db.execute(
+            select(Mail).where(
+                Mail.mail_id.in_(mail_ids),
                 Mail.owner_user_id == current_user
-            ).first()
-            
-            if not mail:
-                results.append({
-                    "mail_id": mail_id,
-                    "status": "failed",
-                    "message": "Mail not found"
-                })
-                continue
-            
-            if mail.status == "sent":
-                results.append({
-                    "mail_id": mail_id,
-                    "status": "skipped",
-                    "message": "Mail already sent"
-                })
-                continue
-            
-            message_id = send_email(
-                recipient=mail.recipient,
-                subject=mail.subject,
-                body=mail.body
             )
-            
-            mail.status = "sent"
-            mail.sent_at = datetime.now(timezone.utc)
-            mail.updated_at = datetime.now(timezone.utc)
-            db.commit()
-            
+        ).scalars()
+    }
+    queued_ids = set()
+    pending = []
+    sent_ids = set()
+    
+    for mail_id in mail_ids:
+        mail = mails.get(mail_id)
+        
+        if not mail:
             results.append({
                 "mail_id": mail_id,
-                "status": "sent",
-                "message": f"Mail sent successfully (MessageId: {message_id})"
+                "status": "failed",
+                "message": "Mail not found"
             })
+            continue
         
-        except Exception as e:
+        if mail.status == "sent" or mail_id in queued_ids:
             results.append({
                 "mail_id": mail_id,
-                "status": "failed",
-                "message": str(e)
+                "status": "skipped",
+                "message": "Mail already sent"
             })
+            continue
+        
+        queued_ids.add(mail_id)
+        result = {"mail_id": mail_id}
+        results.append(result)
+        pending.append((mail, result))
+    
+    if pending:
+        try:
+            send_statuses = await send_bulk_emails(
+                [(mail.recipient, mail.subject, mail.body) for mail, _ in pending]
+            )
+        except HTTPException as e:
+            send_statuses = [{"Status": "Failed", "Error": e.detail}] * len(pending)
+        
+        for (mail, result), send_status in zip(pending, send_statuses):
+            if send_status.get("Status") == "Success":
+                sent_ids.add(mail.mail_id)
+                result["status"] = "sent"
+                result["message"] = f"Mail sent successfully (MessageId: {send_status.get('MessageId')})"
+            else:
+                result["status"] = "failed"
+                result["message"] = send_status.get("Error") or send_status.get("Status")
+    
+    if sent_ids:
+        now = datetime.now(timezone.utc)
+        mails_table = Mail.__table__
+        try:
+            db.execute(
+                mails_table.update().where(mails_table.c.mail_id == bindparam("b_mail_id")),
+                [
+                    {"b_mail_id": mail_id, "status": "sent", "sent_at": now, "updated_at": now}
+                    for mail_id in sent_ids
+                ]
+            )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Database error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to update mail status"
+            )
     
     return {
         "total": len(mail_ids),
@@ -1161,4 +1227,4 @@ async def send_batch_mails(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=HOST, port=PORT)
+    uvicorn.run(app, host=HOST, port=PORT, loop="uvloop")
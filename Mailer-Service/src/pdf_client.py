@@ -1,14 +1,137 @@
 """PDF Service Client"""
 
+import asyncio
+import functools
 import httpx
+import logging
+import orjson
+import random
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
-from config import PDF_SERVICE_URL
+from config import PDF_SERVICE_URL, REDIS_URL, PDF_CACHE_TTL, PDF_REPORT_CACHE_TTL
+from auth import verify_token
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+
+pdf_cache = redis.from_url(REDIS_URL) if REDIS_URL and max(PDF_CACHE_TTL, PDF_REPORT_CACHE_TTL) > 0 else None
+pdf_cache_stats = {"hits": 0, "misses": 0}
+
+_client: Optional[httpx.AsyncClient] = None
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared PDF Service HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=PDF_SERVICE_URL,
+            http2=True,
+            timeout=httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0),
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200, keepalive_expiry=30.0)
+        )
+    return _client
+
+async def close_client() -> None:
+    """Close the shared PDF Service HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def pdf_cache_key(goal_id: UUID, token: str, year: Optional[int] = None, month: Optional[int] = None,
+                  kind: str = "pdf") -> Optional[str]:
+    """
+    Build the cache key for a goal PDF in the given reporting month
+    (defaults to the current month).
+    Keys are scoped to the token's user so cached PDFs are never shared
+    across accounts. Returns None if the token cannot be verified.
+    """
+    try:
+        user_id = verify_token(token)
+    except HTTPException:
+        return None
+    if year is None or month is None:
+        now = datetime.now(timezone.utc)
+        year, month = now.year, now.month
+    return f"{kind}:{user_id}:{goal_id}:{year:04d}-{month:02d}"
+
+async def get_cached_pdf(key: Optional[str]) -> Optional[bytes]:
+    """Return cached PDF bytes, or None on a miss or if caching is unavailable"""
+    if pdf_cache is None or key is None:
+        return None
+    try:
+        cached = await pdf_cache.get(key)
+    except RedisError as e:
+        logger.warning(f"PDF cache lookup failed: {str(e)}")
+        return None
+    pdf_cache_stats["hits" if cached is not None else "misses"] += 1
+    return cached
+
+async def cache_pdf(key: Optional[str], pdf_data: bytes, ttl: int = PDF_CACHE_TTL) -> None:
+    """Store PDF bytes in the cache for `ttl` seconds (PDF_CACHE_TTL by default)"""
+    if pdf_cache is None or key is None or ttl <= 0:
+        return
+    try:
+        await pdf_cache.setex(key, ttl, pdf_data)
+    except RedisError as e:
+        logger.warning(f"PDF cache write failed: {str(e)}")
+
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+PDF_FETCH_CONCURRENCY = 16
+
+def error_detail_from_response(response: httpx.Response):
+    """Extract the error detail from a PDF Service error response, falling back to the raw body"""
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return response.text
+    try:
+        payload = orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return response.text
+    if isinstance(payload, dict) and payload.get("detail"):
+        return payload["detail"]
+    return response.text
+
+def aretry(max_retries: int = 3, base: float = 1.0, cap: float = 30.0, jitter: float = 0.5):
+    """
+    Retry a PDF Service call on transient failures with exponential backoff and jitter.
+    Connection errors and timeouts surface as 502/504 and upstream 4xx responses keep
+    their status, so only 5xx errors are retried; 4xx errors are raised immediately.
+    Only use it on idempotent requests.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                try:
+                    return await fn(*args, **kwargs)
+                except HTTPException as e:
+                    if e.status_code < 500 or attempt == max_retries:
+                        raise
+                    delay = min(cap, base * (2 ** attempt) * (1 + random.random() * jitter))
+                    logger.warning(
+                        f"{fn.__name__} failed ({e.status_code}), retrying in {delay:.1f}s "
+                        f"(attempt {attempt + 1}/{max_retries})"
+                    )
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
+
+async def read_pdf_stream(response: httpx.Response) -> bytes:
+    """Read a streamed PDF response chunk by chunk into a single buffer"""
+    buf = bytearray()
+    async for chunk in response.aiter_bytes(PDF_STREAM_CHUNK_SIZE):
+        buf.extend(chunk)
+    logger.debug(f"Downloaded PDF: {response.num_bytes_downloaded} bytes")
+    return bytes(buf)
+
+@aretry()
 async def generate_report_pdf(goal_id: UUID, year: int, month: int, token: str) -> bytes:
     """
     Generate PDF report from PDF Service for a specific goal
+    Results are cached per user, goal and report month when REDIS_URL is configured
     Note: Year and month parameters are currently not used by the PDF Service,
     but kept for potential future enhancements
     
@@ -24,41 +147,47 @@ async def generate_report_pdf(goal_id: UUID, year: int, month: int, token: str)
     Raises:
         HTTPException: If PDF service request fails
     """
+    cache_key = pdf_cache_key(goal_id, token, year, month, kind="report")
+    cached = await get_cached_pdf(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{PDF_SERVICE_URL}/api/pdf/goal/{goal_id}/stream",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=60.0
-            )
-            
+        client = await get_client()
+        async with client.stream(
+            "GET",
+            f"/api/pdf/goal/{goal_id}/stream",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=60.0
+        ) as response:
             if response.status_code == 200:
-                return response.content
-            else:
-                error_detail = response.text
-                try:
-                    error_detail = response.json().get("detail", response.text)
-                except:
-                    pass
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"PDF Service error: {error_detail}"
-                )
+                pdf_data = await read_pdf_stream(response)
+                # Reports reflect live entries, so they expire much sooner than goal PDFs
+                await cache_pdf(cache_key, pdf_data, PDF_REPORT_CACHE_TTL)
+                return pdf_data
+            await response.aread()
+            error_detail = error_detail_from_response(response)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"PDF Service error: {error_detail}"
+            )
     
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to connect to PDF Service: {str(e)}"
-        )
     except httpx.TimeoutException:
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="PDF Service request timed out"
         )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to connect to PDF Service: {str(e)}"
+        )
 
+@aretry()
 async def fetch_pdf_from_service(goal_id: UUID, token: str) -> Optional[bytes]:
     """
     Fetch PDF from PDF Service for a given goal
+    Results are cached per user, goal and month when REDIS_URL is configured
     
     Args:
         goal_id: ID of the goal to generate PDF for
@@ -70,41 +199,53 @@ async def fetch_pdf_from_service(goal_id: UUID, token: str) -> Optional[bytes]:
     Raises:
         HTTPException: If PDF service request fails
     """
+    cache_key = pdf_cache_key(goal_id, token)
+    cached = await get_cached_pdf(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{PDF_SERVICE_URL}/api/pdf/goal/{goal_id}",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=30.0
-            )
-            
+        client = await get_client()
+        async with client.stream(
+            "GET",
+            f"/api/pdf/goal/{goal_id}",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=30.0
+        ) as response:
             if response.status_code == 200:
-                return response.content
+                pdf_data = await read_pdf_stream(response)
             elif response.status_code == 404:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"PDF not found for goal {goal_id}"
                 )
             else:
+                await response.aread()
+                error_detail = error_detail_from_response(response)
+                # Upstream client errors keep their status so they are not retried
                 raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"PDF Service error: {response.status_code}"
+                    status_code=response.status_code if response.status_code < 500 else status.HTTP_502_BAD_GATEWAY,
+                    detail=f"PDF Service error: {error_detail}"
                 )
+        
+        await cache_pdf(cache_key, pdf_data)
+        return pdf_data
     
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Failed to connect to PDF Service: {str(e)}"
-        )
     except httpx.TimeoutException:
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="PDF Service request timed out"
         )
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to connect to PDF Service: {str(e)}"
+        )
 
 async def generate_pdf_sync(goal_id: UUID, token: str) -> Optional[bytes]:
     """
     Request synchronous PDF generation from PDF Service
+    Not retried, since the POST is not idempotent
     
     Args:
         goal_id: ID of the goal
@@ -117,22 +258,22 @@ async def generate_pdf_sync(goal_id: UUID, token: str) -> Optional[bytes]:
         HTTPException: If request fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{PDF_SERVICE_URL}/api/pdf/generate",
-                json={"goal_id": str(goal_id)},
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=30.0
-            )
-            
+        client = await get_client()
+        async with client.stream(
+            "POST",
+            "/api/pdf/generate",
+            json={"goal_id": str(goal_id)},
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=30.0
+        ) as response:
             if response.status_code == 200:
-                return response.content
-            else:
-                error_detail = response.json().get("detail", response.text)
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"PDF Service error: {error_detail}"
-                )
+                return await read_pdf_stream(response)
+            await response.aread()
+            error_detail = error_detail_from_response(response)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"PDF Service error: {error_detail}"
+            )
     
     except httpx.RequestError as e:
         raise HTTPException(
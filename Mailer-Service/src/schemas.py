@@ -1,11 +1,43 @@
 """Pydantic schemas for Mailer Service"""
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 from datetime import datetime
 from uuid import UUID
 from typing import Optional
 import re
 
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+# RE2 matches in linear time without backtracking; fall back to re if unavailable
+_EMAIL_RE = _regex_engine.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+def _validate_csv_emails(v: str) -> str:
+    """
+    Validate and normalize a comma-separated list of email addresses
+    in a single scan over the input
+    """
+    emails = []
+    start = 0
+    length = len(v)
+    
+    while start <= length:
+        end = v.find(',', start)
+        if end == -1:
+            end = length
+        email = v[start:end].strip()
+        if email and not _EMAIL_RE.match(email):
+            raise ValueError(f'Invalid email address: {email}')
+        emails.append(email)
+        start = end + 1
+    
+    if len(emails) == 1 and not emails[0]:
+        raise ValueError('At least one email address is required')
+    
+    return ', '.join(emails)
+
 class EmailSettingsCreate(BaseModel):
     """Schema for creating/updating email settings for a goal"""
     goal_id: UUID
@@ -17,19 +49,7 @@ class EmailSettingsCreate(BaseModel):
     @classmethod
     def validate_emails(cls, v: str) -> str:
         """Validate comma-separated email addresses"""
-        if not v or not v.strip():
-            raise ValueError('At least one email address is required')
-        
-        emails = [email.strip() for email in v.split(',')]
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        for email in emails:
-            if not email:
-                continue
-            if not re.match(email_regex, email):
-                raise ValueError(f'Invalid email address: {email}')
-        
-        return ', '.join(emails)
+        return _validate_csv_emails(v)
 
 class EmailSettingsUpdate(BaseModel):
     """Schema for updating email settings"""
@@ -43,19 +63,7 @@ class EmailSettingsUpdate(BaseModel):
         """Validate comma-separated email addresses"""
         if v is None:
             return v
-        if not v.strip():
-            raise ValueError('At least one email address is required')
-        
-        emails = [email.strip() for email in v.split(',')]
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        for email in emails:
-            if not email:
-                continue
-            if not re.match(email_regex, email):
-                raise ValueError(f'Invalid email address: {email}')
-        
-        return ', '.join(emails)
+        return _validate_csv_emails(v)
 
 class EmailSettingsResponse(BaseModel):
     """Schema for email settings response"""
@@ -69,9 +77,7 @@ class EmailSettingsResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
-        populate_by_name = True  
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 class SendNowRequest(BaseModel):
     """Schema for sending email now"""
@@ -90,19 +96,7 @@ class MailCreate(BaseModel):
     @classmethod
     def validate_emails(cls, v: str) -> str:
         """Validate comma-separated email addresses"""
-        if not v or not v.strip():
-            raise ValueError('At least one email address is required')
-        
-        emails = [email.strip() for email in v.split(',')]
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        for email in emails:
-            if not email:
-                continue
-            if not re.match(email_regex, email):
-                raise ValueError(f'Invalid email address: {email}')
-        
-        return ', '.join(emails)
+        return _validate_csv_emails(v)
 
 class MailUpdate(BaseModel):
     """Schema for updating mail"""
@@ -117,19 +111,7 @@ class MailUpdate(BaseModel):
         """Validate comma-separated email addresses"""
         if v is None:
             return v
-        if not v.strip():
-            raise ValueError('At least one email address is required')
-        
-        emails = [email.strip() for email in v.split(',')]
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        for email in emails:
-            if not email:
-                continue
-            if not re.match(email_regex, email):
-                raise ValueError(f'Invalid email address: {email}')
-        
-        return ', '.join(emails)
+        return _validate_csv_emails(v)
 
 class MailResponse(BaseModel):
     """Schema for mail response"""
@@ -146,12 +128,27 @@ class MailResponse(BaseModel):
     sent_at: Optional[datetime]
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class MailListItem(BaseModel):
+    """Schema for mail list entries (omits the mail body)"""
+    mail_id: UUID
+    owner_user_id: str
+    related_goal_id: Optional[UUID]
+    recipient: str
+    subject: Optional[str]
+    pdf_url: Optional[str]
+    status: str
+    sent_when: Optional[float]
+    created_at: datetime
+    sent_at: Optional[datetime]
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
 
 class MailListResponse(BaseModel):
     """Schema for mail list response"""
-    mails: list[MailResponse]
+    mails: list[MailListItem]
     total: int
     page: int
     page_size: int
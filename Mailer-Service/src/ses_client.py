@@ -1,10 +1,15 @@
 """AWS SES Email Client"""
 
-import boto3
+import aioboto3
+import base64
+import json
+import time
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from typing import Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
+from email.message import EmailMessage, MIMEPart
 from config import (
     AWS_REGION,
     AWS_ACCESS_KEY_ID,
@@ -14,14 +19,54 @@ from config import (
 )
 from fastapi import HTTPException, status
 
-ses_client = boto3.client(
-    'ses',
+session = aioboto3.Session(
     region_name=AWS_REGION,
     aws_access_key_id=AWS_ACCESS_KEY_ID,
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY
 )
 
-def send_email(
+ses_config = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=30
+)
+
+_client = None
+_client_stack: Optional[AsyncExitStack] = None
+
+BULK_DESTINATIONS_LIMIT = 50
+PASSTHROUGH_TEMPLATE_NAME = "trackify-passthrough"
+
+VERIFIED_EMAILS_CACHE_SECONDS = 60.0
+
+PDF_ENCODE_CACHE_SIZE = 8
+
+_passthrough_template_ready = False
+_verified_cache = {"ts": 0.0, "set": frozenset()}
+
+async def get_client():
+    """Return the shared SES client, opening it on first use"""
+    global _client, _client_stack
+    if _client is None:
+        _client_stack = AsyncExitStack()
+        _client = await _client_stack.enter_async_context(session.client('ses', config=ses_config))
+    return _client
+
+async def close_client() -> None:
+    """Close the shared SES client"""
+    global _client, _client_stack
+    if _client_stack is not None:
+        await _client_stack.aclose()
+    _client = None
+    _client_stack = None
+
+@lru_cache(maxsize=PDF_ENCODE_CACHE_SIZE)
+def encode_pdf_attachment(pdf_attachment: bytes) -> str:
+    """Base64-encode PDF bytes for a MIME part, reusing the result when the same report is sent again"""
+    return base64.encodebytes(pdf_attachment).decode('ascii')
+
+async def send_email(
     recipient: str,
     subject: str,
     body: str,
@@ -51,26 +96,30 @@ def send_email(
         if not recipients:
             raise ValueError("At least one recipient email is required")
         
+        ses_client = await get_client()
+        
         if pdf_attachment and pdf_filename:
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg['Subject'] = subject
             msg['From'] = SES_SENDER_EMAIL
             msg['To'] = ', '.join(recipients)  
+            msg.set_content(body, subtype='html', charset=SES_CHARSET)
             
-            html_part = MIMEText(body, 'html', SES_CHARSET)
-            msg.attach(html_part)
-            
-            pdf_part = MIMEApplication(pdf_attachment, Name=pdf_filename)
-            pdf_part['Content-Disposition'] = f'attachment; filename=\"{pdf_filename}\"'
+            pdf_part = MIMEPart()
+            pdf_part.add_header('Content-Type', 'application/pdf', name=pdf_filename)
+            pdf_part.add_header('Content-Transfer-Encoding', 'base64')
+            pdf_part.add_header('Content-Disposition', 'attachment', filename=pdf_filename)
+            pdf_part.set_payload(encode_pdf_attachment(bytes(pdf_attachment)))
+            msg.make_mixed()
             msg.attach(pdf_part)
             
-            response = ses_client.send_raw_email(
+            response = await ses_client.send_raw_email(
                 Source=SES_SENDER_EMAIL,
                 Destinations=recipients,  
-                RawMessage={'Data': msg.as_string()}
+                RawMessage={'Data': msg.as_bytes()}
             )
         else:
-            response = ses_client.send_email(
+            response = await ses_client.send_email(
                 Source=SES_SENDER_EMAIL,
                 Destination={'ToAddresses': recipients},  
                 Message={
@@ -97,9 +146,133 @@ def send_email(
             detail=f"Failed to send email: {str(e)}"
         )
 
-def verify_email(email: str) -> bool:
+async def ensure_passthrough_template() -> None:
     """
-    Verify an email address is configured in SES
+    Create the SES template used for bulk sends if it does not exist yet.
+    The template renders the per-destination subject and HTML body as-is.
+    """
+    global _passthrough_template_ready
+    if _passthrough_template_ready:
+        return
+    
+    # Triple braces stop SES from HTML-escaping the subject and body
+    template = {
+        'TemplateName': PASSTHROUGH_TEMPLATE_NAME,
+        'SubjectPart': '{{{subject}}}',
+        'HtmlPart': '{{{body}}}'
+    }
+    ses_client = await get_client()
+    try:
+        await ses_client.create_template(Template=template)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'AlreadyExists':
+            raise
+        # An existing template may predate the current definition
+        await ses_client.update_template(Template=template)
+    _passthrough_template_ready = True
+
+async def send_bulk(
+    template_name: str,
+    default_data: dict,
+    recipients: list[str],
+    replacement_data: Optional[list[dict]] = None
+) -> list[dict]:
+    """
+    Send one templated email per recipient with SendBulkTemplatedEmail,
+    up to 50 destinations per API call
+    
+    Args:
+        template_name: Name of an existing SES template
+        default_data: Template data used where a destination has no replacement
+        recipients: One entry per email - each entry can be comma-separated
+        replacement_data: Optional per-recipient template data, parallel to recipients
+    
+    Returns:
+        One SES status dict per recipient, in input order, with keys
+        'Status' ('Success' on success), 'MessageId' and 'Error'
+    """
+    ses_client = await get_client()
+    default_json = json.dumps(default_data)
+    statuses = []
+    for start in range(0, len(recipients), BULK_DESTINATIONS_LIMIT):
+        chunk = recipients[start:start + BULK_DESTINATIONS_LIMIT]
+        chunk_data = replacement_data[start:start + BULK_DESTINATIONS_LIMIT] if replacement_data else [{}] * len(chunk)
+        destinations = [
+            {
+                'Destination': {
+                    'ToAddresses': [email.strip() for email in recipient.split(',') if email.strip()]
+                },
+                'ReplacementTemplateData': json.dumps(data)
+            }
+            for recipient, data in zip(chunk, chunk_data)
+        ]
+        
+        try:
+            response = await ses_client.send_bulk_templated_email(
+                Source=SES_SENDER_EMAIL,
+                Template=template_name,
+                DefaultTemplateData=default_json,
+                Destinations=destinations
+            )
+            statuses.extend(response['Status'])
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            statuses.extend(
+                {'Status': error_code, 'Error': f"SES Error ({error_code}): {error_message}"}
+                for _ in chunk
+            )
+        except Exception as e:
+            # Connection errors and timeouts fail this chunk only; earlier chunks already went out
+            statuses.extend(
+                {'Status': 'Failed', 'Error': f"Failed to send email: {str(e)}"}
+                for _ in chunk
+            )
+    
+    return statuses
+
+async def send_bulk_emails(messages: list[tuple[str, str, str]]) -> list[dict]:
+    """
+    Send many emails with individual subjects and bodies through the
+    pass-through template, up to 50 per API call
+    
+    Args:
+        messages: (recipient, subject, body) tuples - recipient can be comma-separated
+    
+    Returns:
+        One SES status dict per message, in input order, with keys
+        'Status' ('Success' on success), 'MessageId' and 'Error'
+    
+    Raises:
+        HTTPException: If the bulk template cannot be created
+    """
+    try:
+        await ensure_passthrough_template()
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        error_message = e.response['Error']['Message']
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"SES Error ({error_code}): {error_message}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to send email: {str(e)}"
+        )
+    
+    return await send_bulk(
+        PASSTHROUGH_TEMPLATE_NAME,
+        {'subject': '', 'body': ''},
+        [recipient for recipient, _, _ in messages],
+        [{'subject': subject or '', 'body': body or ''} for _, subject, body in messages]
+    )
+
+async def verify_email(email: str) -> bool:
+    """
+    Verify an email address is configured in SES (case-insensitive)
+    The verified address list is cached for VERIFIED_EMAILS_CACHE_SECONDS
     
     Args:
         email: Email address to verify
@@ -108,13 +281,20 @@ def verify_email(email: str) -> bool:
         True if email is verified, False otherwise
     """
     try:
-        response = ses_client.list_verified_email_addresses()
-        return email in response.get('VerifiedEmailAddresses', [])
+        now = time.monotonic()
+        if not _verified_cache["ts"] or now - _verified_cache["ts"] > VERIFIED_EMAILS_CACHE_SECONDS:
+            ses_client = await get_client()
+            response = await ses_client.list_verified_email_addresses()
+            _verified_cache.update(
+                ts=now,
+                set=frozenset(address.lower() for address in response.get('VerifiedEmailAddresses', []))
+            )
+        return email.strip().lower() in _verified_cache["set"]
     except Exception as e:
         print(f"Error verifying email: {str(e)}")
         return False
 
-def send_test_email(email: str, subject: str = "Test Email") -> str:
+async def send_test_email(email: str, subject: str = "Test Email") -> str:
     """
     Send a test email to verify SES configuration
     
@@ -125,7 +305,7 @@ def send_test_email(email: str, subject: str = "Test Email") -> str:
     Returns:
         Message ID from SES
     """
-    return send_email(
+    return await send_email(
         recipient=email,
         subject=subject,
         body="This is a test email from Trackify Mailer Service."
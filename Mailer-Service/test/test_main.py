@@ -3,31 +3,50 @@ Comprehensive Unit and Integration Tests for Mailer-Service
 """
 
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from unittest.mock import patch, AsyncMock, MagicMock
 from datetime import datetime, timezone
 from decimal import Decimal
-from uuid import uuid4
+from uuid import UUID, uuid4
+import httpx
+import json
 import sys
 import os
 from sqlalchemy.sql import text
+from botocore.exceptions import ClientError, EndpointConnectionError
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from main import app, get_db
 from database import Base, Mail
 from auth import create_access_token
+import ses_client
+import pdf_client
 
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base.metadata.create_all(bind=engine)
+
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite"""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def override_get_db():
     """Override database dependency with test database"""
@@ -44,23 +63,29 @@ client = TestClient(app)
 
 def run_init_sql():
     """Run test_init.sql to create the database schema"""
-    with engine.connect() as connection:
+    with engine.begin() as connection:
         with open(os.path.join(os.path.dirname(__file__), '../../Database/mails_test.sql'), 'r') as file:
             sql_script = file.read()
             connection.execute(text(sql_script))
 
 
+Base.metadata.create_all(bind=engine)
+run_init_sql()
+
+
 @pytest.fixture(autouse=True)
 def reset_db():
-    """Reset database before each test"""
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    run_init_sql()  
+    """Run each test inside a transaction that is rolled back afterwards"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
     yield
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    connection.close()
+    TestingSessionLocal.configure(bind=engine, join_transaction_mode="conservative_savepoint")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user():
     """Create test user credentials"""
     user_id = "test_google_sub_12345"
@@ -68,7 +93,7 @@ def test_user():
     return {"user_id": user_id, "token": token}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_goal_id():
     """Create test goal ID"""
     return uuid4()
@@ -476,6 +501,120 @@ def test_send_mail_unauthorized():
     assert response.status_code == 403
 
 
+# ============================================================================
+# BATCH SEND TESTS
+# ============================================================================
+
+def create_pending_mails(user_id, count):
+    """Create pending mail records and return their IDs"""
+    db = TestingSessionLocal()
+    now = datetime.now(timezone.utc)
+    mails = [
+        Mail(
+            owner_user_id=user_id,
+            recipient=f"batch{i}@example.com",
+            subject=f"Batch {i}",
+            body="<html><body>Batch</body></html>",
+            status="pending",
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+    db.add_all(mails)
+    db.commit()
+    mail_ids = [str(mail.mail_id) for mail in mails]
+    db.close()
+    return mail_ids
+
+
+def get_mail_statuses(mail_ids):
+    """Return the stored status of each mail, in order"""
+    db = TestingSessionLocal()
+    statuses = {str(mail.mail_id): mail.status for mail in db.query(Mail).all()}
+    db.close()
+    return [statuses[mail_id] for mail_id in mail_ids]
+
+
+@patch('ses_client.BULK_DESTINATIONS_LIMIT', 2)
+@patch('ses_client.ensure_passthrough_template', new_callable=AsyncMock)
+@patch('ses_client.get_client', new_callable=AsyncMock)
+def test_send_batch_mails_partial_chunk_failure(mock_get_client, mock_template, test_user):
+    """Test that a failed SES chunk does not discard the chunks already sent"""
+    ses = MagicMock()
+    ses.send_bulk_templated_email = AsyncMock(side_effect=[
+        {"Status": [
+            {"Status": "Success", "MessageId": "message-1"},
+            {"Status": "Success", "MessageId": "message-2"}
+        ]},
+        EndpointConnectionError(endpoint_url="https://email.us-east-1.amazonaws.com")
+    ])
+    mock_get_client.return_value = ses
+    mail_ids = create_pending_mails(test_user['user_id'], 3)
+    
+    response = client.post(
+        "/api/mail/batch/send",
+        headers={"Authorization": f"Bearer {test_user['token']}"},
+        json=mail_ids
+    )
+    
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["sent", "sent", "failed"]
+    assert get_mail_statuses(mail_ids) == ["sent", "sent", "pending"]
+
+
+@patch('ses_client._passthrough_template_ready', False)
+@patch('ses_client.get_client', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_send_bulk_emails_passes_subject_through(mock_get_client):
+    """Test the bulk path sends subjects unescaped and maps statuses in order"""
+    ses = MagicMock()
+    ses.create_template = AsyncMock()
+    ses.send_bulk_templated_email = AsyncMock(return_value={"Status": [
+        {"Status": "Success", "MessageId": "message-1"},
+        {"Status": "MessageRejected", "Error": "Email address is not verified."}
+    ]})
+    mock_get_client.return_value = ses
+    
+    statuses = await ses_client.send_bulk_emails([
+        ("tom@example.com, jerry@example.com", "Tom & Jerry's report", "<p>Hours</p>"),
+        ("spike@example.com", None, None)
+    ])
+    
+    template = ses.create_template.call_args.kwargs["Template"]
+    assert template["SubjectPart"] == "{{{subject}}}"
+    assert template["HtmlPart"] == "{{{body}}}"
+    
+    destinations = ses.send_bulk_templated_email.call_args.kwargs["Destinations"]
+    assert destinations[0]["Destination"]["ToAddresses"] == ["tom@example.com", "jerry@example.com"]
+    assert json.loads(destinations[0]["ReplacementTemplateData"]) == {
+        "subject": "Tom & Jerry's report",
+        "body": "<p>Hours</p>"
+    }
+    assert json.loads(destinations[1]["ReplacementTemplateData"]) == {"subject": "", "body": ""}
+    assert [entry["Status"] for entry in statuses] == ["Success", "MessageRejected"]
+    assert statuses[0]["MessageId"] == "message-1"
+
+
+@patch('ses_client._passthrough_template_ready', False)
+@patch('ses_client.get_client', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_ensure_passthrough_template_updates_existing(mock_get_client):
+    """Test an existing pass-through template is brought up to date"""
+    ses = MagicMock()
+    ses.create_template = AsyncMock(side_effect=ClientError(
+        {"Error": {"Code": "AlreadyExists", "Message": "Template already exists"}},
+        "CreateTemplate"
+    ))
+    ses.update_template = AsyncMock()
+    mock_get_client.return_value = ses
+    
+    await ses_client.ensure_passthrough_template()
+    
+    assert ses.update_template.call_args.kwargs["Template"]["SubjectPart"] == "{{{subject}}}"
+
+
 # ============================================================================
 # EMAIL SETTINGS TESTS
 # ============================================================================
@@ -502,6 +641,74 @@ def test_create_email_settings(test_user, test_goal_id):
     assert data["enabled"] is True
 
 
+SETTINGS_INDEX_MIGRATION = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'Database', 'migrations', '001_mails_settings_unique_index.sql'
+)
+
+
+def test_settings_index_migration_deduplicates_existing_rows(test_user):
+    """Test the settings index migration removes duplicate settings from an older table"""
+    legacy_engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=legacy_engine)
+    with legacy_engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_mails_owner_goal_settings"))
+    
+    goal_id = uuid4()
+    older = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    newer = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    LegacySession = sessionmaker(bind=legacy_engine)
+    db = LegacySession()
+    db.add_all([
+        Mail(owner_user_id=test_user['user_id'], related_goal_id=goal_id, recipient="old@example.com",
+             status="scheduled", created_at=older, updated_at=older),
+        Mail(owner_user_id=test_user['user_id'], related_goal_id=goal_id, recipient="new@example.com",
+             status="scheduled", created_at=older, updated_at=newer),
+        Mail(owner_user_id=test_user['user_id'], related_goal_id=goal_id, recipient="sent@example.com",
+             status="sent", created_at=older, updated_at=older)
+    ])
+    db.commit()
+    db.close()
+    
+    with open(SETTINGS_INDEX_MIGRATION) as migration:
+        legacy_engine.raw_connection().driver_connection.executescript(migration.read())
+    
+    db = LegacySession()
+    recipients = sorted(mail.recipient for mail in db.query(Mail).all())
+    db.close()
+    assert recipients == ["new@example.com", "sent@example.com"]
+    assert "uq_mails_owner_goal_settings" in [index["name"] for index in inspect(legacy_engine).get_indexes("mails")]
+
+
+def test_create_email_settings_twice_updates(test_user):
+    """Test posting settings for the same goal again updates the existing row"""
+    goal_id = str(uuid4())
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    
+    first = client.post(
+        "/api/mail/settings",
+        headers=headers,
+        json={"goal_id": goal_id, "recipient_email": "first@example.com", "enabled": False, "send_day": 5}
+    )
+    second = client.post(
+        "/api/mail/settings",
+        headers=headers,
+        json={"goal_id": goal_id, "recipient_email": "second@example.com", "enabled": True, "send_day": 20}
+    )
+    
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.json()["mail_id"] == first.json()["mail_id"]
+    assert second.json()["recipient"] == "second@example.com"
+    assert float(second.json()["sent_when"]) == 20
+    
+    db = TestingSessionLocal()
+    rows = db.query(Mail).filter(Mail.related_goal_id == UUID(goal_id), Mail.status == "scheduled").all()
+    db.close()
+    assert len(rows) == 1
+    assert rows[0].recipient == "second@example.com"
+    assert rows[0].enabled is True
+
+
 def test_get_email_settings_by_goal(test_user, test_mail):
     """Test getting email settings for a specific goal"""
     response = client.get(
@@ -564,6 +771,119 @@ async def test_send_report_now(mock_generate, mock_send, test_user, test_goal_id
     assert response.status_code in [200, 500]
 
 
+# ============================================================================
+# PDF CLIENT TESTS
+# ============================================================================
+
+def pdf_service_client(responses, calls):
+    """Build an httpx client that answers PDF Service requests from a list of (status, body) or exceptions"""
+    def handler(request):
+        calls.append(request)
+        answer = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(answer, Exception):
+            raise answer
+        status_code, content = answer
+        return httpx.Response(status_code, content=content)
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://pdf-service")
+
+
+@patch('pdf_client.asyncio.sleep', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_fetch_pdf_retries_upstream_server_error(mock_sleep, test_user, test_goal_id):
+    """Test that an upstream 5xx is retried until the PDF Service recovers"""
+    calls = []
+    http_client = pdf_service_client([(503, b'{"detail": "busy"}'), (200, b"%PDF-1.4")], calls)
+    
+    with patch('pdf_client.get_client', new=AsyncMock(return_value=http_client)):
+        pdf_data = await pdf_client.fetch_pdf_from_service(test_goal_id, test_user['token'])
+    
+    assert pdf_data == b"%PDF-1.4"
+    assert len(calls) == 2
+    assert mock_sleep.await_count == 1
+
+
+@patch('pdf_client.asyncio.sleep', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_fetch_pdf_does_not_retry_upstream_client_error(mock_sleep, test_user, test_goal_id):
+    """Test that an upstream 4xx keeps its status and is not retried"""
+    calls = []
+    http_client = pdf_service_client([(403, b'{"detail": "Not your goal"}')], calls)
+    
+    with patch('pdf_client.get_client', new=AsyncMock(return_value=http_client)):
+        with pytest.raises(HTTPException) as exc_info:
+            await pdf_client.fetch_pdf_from_service(test_goal_id, test_user['token'])
+    
+    assert exc_info.value.status_code == 403
+    assert "Not your goal" in exc_info.value.detail
+    assert len(calls) == 1
+    mock_sleep.assert_not_awaited()
+
+
+@patch('pdf_client.asyncio.sleep', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_generate_pdf_sync_is_not_retried(mock_sleep, test_user, test_goal_id):
+    """Test that the non-idempotent generate POST is sent only once"""
+    calls = []
+    http_client = pdf_service_client([(503, b'{"detail": "busy"}'), (200, b"%PDF-1.4")], calls)
+    
+    with patch('pdf_client.get_client', new=AsyncMock(return_value=http_client)):
+        with pytest.raises(HTTPException) as exc_info:
+            await pdf_client.generate_pdf_sync(test_goal_id, test_user['token'])
+    
+    assert exc_info.value.status_code == 503
+    assert len(calls) == 1
+    mock_sleep.assert_not_awaited()
+
+
+@patch('pdf_client.asyncio.sleep', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_generate_report_pdf_timeout_returns_504(mock_sleep, test_user, test_goal_id):
+    """Test that a PDF Service timeout surfaces as 504 and is retried"""
+    calls = []
+    http_client = pdf_service_client([httpx.ReadTimeout("timed out")], calls)
+    
+    with patch('pdf_client.get_client', new=AsyncMock(return_value=http_client)):
+        with pytest.raises(HTTPException) as exc_info:
+            await pdf_client.generate_report_pdf(test_goal_id, 2025, 1, test_user['token'])
+    
+    assert exc_info.value.status_code == 504
+    assert mock_sleep.await_count > 0
+    assert len(calls) == mock_sleep.await_count + 1
+
+
+@pytest.mark.asyncio
+async def test_generate_report_pdf_uses_report_cache_ttl(test_user, test_goal_id):
+    """Test that report PDFs are cached with the short report TTL"""
+    calls = []
+    http_client = pdf_service_client([(200, b"%PDF-1.4")], calls)
+    mock_cache = MagicMock()
+    mock_cache.get = AsyncMock(return_value=None)
+    mock_cache.setex = AsyncMock()
+    
+    with patch('pdf_client.get_client', new=AsyncMock(return_value=http_client)), \
+         patch('pdf_client.pdf_cache', mock_cache):
+        pdf_data = await pdf_client.generate_report_pdf(test_goal_id, 2025, 1, test_user['token'])
+    
+    assert pdf_data == b"%PDF-1.4"
+    key, ttl, data = mock_cache.setex.await_args.args
+    assert key.startswith("report:")
+    assert ttl == pdf_client.PDF_REPORT_CACHE_TTL
+    assert ttl < pdf_client.PDF_CACHE_TTL
+
+
+@pytest.mark.asyncio
+async def test_cache_pdf_skips_write_when_ttl_is_zero():
+    """Test that a zero TTL disables caching for that kind of PDF only"""
+    mock_cache = MagicMock()
+    mock_cache.setex = AsyncMock()
+    
+    with patch('pdf_client.pdf_cache', mock_cache):
+        await pdf_client.cache_pdf("pdf:user:goal:2025-01", b"%PDF-1.4", 0)
+        await pdf_client.cache_pdf("report:user:goal:2025-01", b"%PDF-1.4", 600)
+    
+    mock_cache.setex.assert_awaited_once_with("report:user:goal:2025-01", 600, b"%PDF-1.4")
+
+
 # ============================================================================
 # EDGE CASES AND ERROR HANDLING
 # ============================================================================
@@ -613,25 +933,27 @@ def test_create_email_settings_invalid_day(test_user, test_goal_id):
 def test_get_mail_list_only_own_mails(test_user):
     """Test that users only see their own mails"""
     db = TestingSessionLocal()
-    for i in range(3):
-        mail = Mail(
+    now = datetime.now(timezone.utc)
+    mails = [
+        Mail(
             owner_user_id=test_user['user_id'],
             recipient=f"user{i}@example.com",
             status="pending",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=now,
+            updated_at=now
         )
-        db.add(mail)
-    
-    for i in range(2):
-        mail = Mail(
+        for i in range(3)
+    ] + [
+        Mail(
             owner_user_id="other_user",
             recipient=f"other{i}@example.com",
             status="pending",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=now,
+            updated_at=now
         )
-        db.add(mail)
+        for i in range(2)
+    ]
+    db.add_all(mails)
     db.commit()
     db.close()
     
@@ -2,13 +2,20 @@
 
 import jwt
 import httpx
+import time
+from cachetools import TTLCache
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from config import SECRET_KEY, ALGORITHM, USER_SERVICE_URL
+from config import get_settings
+from http_clients import get_http_client
+
+settings = get_settings()
 
 security = HTTPBearer()
 
+_token_cache = TTLCache(maxsize=10000, ttl=settings.TOKEN_CACHE_TTL)
+
 def create_access_token(user_id: str, expires_delta: timedelta = None) -> str:
     """Create JWT access token for testing purposes"""
     if expires_delta:
@@ -17,16 +24,23 @@ def create_access_token(user_id: str, expires_delta: timedelta = None) -> str:
         expire = datetime.now(timezone.utc) + timedelta(hours=24)
     
     to_encode = {"sub": user_id, "exp": expire}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> str:
     """
     Verify JWT token and return user_id
     This token comes from the User Service
+    Decoded tokens are cached for TOKEN_CACHE_TTL seconds, never past their expiry
     """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at is None or time.time() < expires_at:
+            return user_id
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -34,6 +48,7 @@ def verify_token(token: str) -> str:
                 detail="Invalid token: missing user_id",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        _token_cache[token] = (user_id, payload.get("exp"))
         return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -48,30 +63,36 @@ def verify_token(token: str) -> str:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+async def get_user_and_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> tuple[str, str]:
     """
-    FastAPI dependency to extract and verify current user from Bearer token
+    FastAPI dependency to verify the Bearer token once and return (user_id, token)
     """
     token = credentials.credentials
     user_id = verify_token(token)
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{USER_SERVICE_URL}/api/auth/verify",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=5.0
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.USER_SERVICE_URL}/api/auth/verify",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=5.0
+        )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token verification failed with User Service",
+                headers={"WWW-Authenticate": "Bearer"},
             )
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token verification failed with User Service",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
     except httpx.RequestError:
         pass
     
-    return user_id
+    return user_id, token
+
+async def get_current_user(user_and_token: tuple[str, str] = Depends(get_user_and_token)) -> str:
+    """
+    FastAPI dependency to extract and verify current user from Bearer token
+    """
+    return user_and_token[0]
 
 def extract_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Extract token string from Bearer credentials"""
@@ -1,40 +1,97 @@
 """Configuration module for the PDF Microservice"""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 
-ENV = os.getenv("ENV", "prod")
-
-if ENV == "dev" or ENV == "prod":
-    load_dotenv(".env")
-
-# Database Configuration (optional, for caching/history)
-DATABASE_URL = os.getenv("DATABASE_URL")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = int(os.getenv("DB_PORT", "5432"))
-POSTGRES_USER = os.getenv("POSTGRES_USER")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-POSTGRES_DB = os.getenv("POSTGRES_DB", "trackify_pdf")
-
-# JWT Configuration
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-
-# Microservices URLs
-USER_SERVICE_URL = os.getenv("USER_SERVICE_URL", "http://user-service:80")
-GOALS_SERVICE_URL = os.getenv("GOALS_SERVICE_URL", "http://goals-service:80")
-ENTRIES_SERVICE_URL = os.getenv("ENTRIES_SERVICE_URL", "http://entries-service:80")
-
-# PDF Configuration
-PDF_TEMP_DIR = os.getenv("PDF_TEMP_DIR", "/tmp/trackify_pdfs")
-PDF_STORAGE_PATH = os.getenv("PDF_STORAGE_PATH", "./pdfs")
-MAX_PDF_SIZE_MB = int(os.getenv("MAX_PDF_SIZE_MB", "10"))
-
-# Server Configuration
-HOST = os.getenv("HOST", "0.0.0.0")
-PORT = int(os.getenv("PORT", "8005"))
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
-CORS_CREDENTIALS = os.getenv("CORS_CREDENTIALS", "True").lower() == "true"
-CORS_METHODS = os.getenv("CORS_METHODS", "*").split(",")
-CORS_HEADERS = os.getenv("CORS_HEADERS", "*").split(",")
-DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+@dataclass(frozen=True)
+class Settings:
+    """Service settings, parsed once from the environment"""
+    ENV: str
+
+    # Database Configuration (optional, for caching/history)
+    DATABASE_URL: str | None
+    DB_HOST: str | None
+    DB_PORT: int
+    POSTGRES_USER: str | None
+    POSTGRES_PASSWORD: str | None
+    POSTGRES_DB: str
+
+    # JWT Configuration
+    SECRET_KEY: str | None
+    ALGORITHM: str
+    TOKEN_CACHE_TTL: int
+
+    # Microservices URLs
+    USER_SERVICE_URL: str
+    GOALS_SERVICE_URL: str
+    ENTRIES_SERVICE_URL: str
+
+    # HTTP Client Configuration (seconds)
+    HTTP_TIMEOUTS: dict
+
+    # PDF Configuration
+    PDF_TEMP_DIR: str
+    PDF_STORAGE_PATH: str
+    MAX_PDF_SIZE_MB: int
+    PDF_CACHE_SIZE: int
+    PDF_CACHE_TTL: int  # 0 disables rendered PDF caching
+    PDF_STORAGE_RETENTION_MINUTES: int  # 0 keeps saved PDFs forever
+    PDF_RENDER_WORKERS: int
+
+    # Server Configuration
+    HOST: str
+    PORT: int
+    CORS_ORIGINS: tuple[str, ...]
+    CORS_CREDENTIALS: bool
+    CORS_METHODS: tuple[str, ...]
+    CORS_HEADERS: tuple[str, ...]
+    DEBUG: bool
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings from the environment on first call and return the same object afterwards.
+    The .env file is only read in dev, or in prod when the environment does not already
+    provide the secrets (the Docker images ship one), and only if it exists.
+    """
+    env = os.getenv("ENV", "prod")
+    if (env == "dev" or (env == "prod" and not os.getenv("SECRET_KEY"))) and os.path.isfile(".env"):
+        load_dotenv(".env")
+
+    return Settings(
+        ENV=env,
+        DATABASE_URL=os.getenv("DATABASE_URL"),
+        DB_HOST=os.getenv("DB_HOST"),
+        DB_PORT=int(os.getenv("DB_PORT", "5432")),
+        POSTGRES_USER=os.getenv("POSTGRES_USER"),
+        POSTGRES_PASSWORD=os.getenv("POSTGRES_PASSWORD"),
+        POSTGRES_DB=os.getenv("POSTGRES_DB", "trackify_pdf"),
+        SECRET_KEY=os.getenv("SECRET_KEY"),
+        ALGORITHM=os.getenv("ALGORITHM", "HS256"),
+        TOKEN_CACHE_TTL=int(os.getenv("TOKEN_CACHE_TTL", "30")),
+        USER_SERVICE_URL=os.getenv("USER_SERVICE_URL", "http://user-service:80"),
+        GOALS_SERVICE_URL=os.getenv("GOALS_SERVICE_URL", "http://goals-service:80"),
+        ENTRIES_SERVICE_URL=os.getenv("ENTRIES_SERVICE_URL", "http://entries-service:80"),
+        HTTP_TIMEOUTS={
+            "connect": float(os.getenv("HTTP_CONNECT_TIMEOUT", "5.0")),
+            "read": float(os.getenv("HTTP_READ_TIMEOUT", "10.0")),
+            "write": float(os.getenv("HTTP_WRITE_TIMEOUT", "10.0")),
+            "pool": float(os.getenv("HTTP_POOL_TIMEOUT", "5.0")),
+        },
+        PDF_TEMP_DIR=os.getenv("PDF_TEMP_DIR", "/tmp/trackify_pdfs"),
+        PDF_STORAGE_PATH=os.getenv("PDF_STORAGE_PATH", "./pdfs"),
+        MAX_PDF_SIZE_MB=int(os.getenv("MAX_PDF_SIZE_MB", "10")),
+        PDF_CACHE_SIZE=int(os.getenv("PDF_CACHE_SIZE", "256")),
+        PDF_CACHE_TTL=int(os.getenv("PDF_CACHE_TTL", "60")),
+        PDF_STORAGE_RETENTION_MINUTES=int(os.getenv("PDF_STORAGE_RETENTION_MINUTES", "1440")),
+        PDF_RENDER_WORKERS=int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1))),
+        HOST=os.getenv("HOST", "0.0.0.0"),
+        PORT=int(os.getenv("PORT", "8005")),
+        CORS_ORIGINS=tuple(os.getenv("CORS_ORIGINS", "*").split(",")),
+        CORS_CREDENTIALS=os.getenv("CORS_CREDENTIALS", "True").lower() == "true",
+        CORS_METHODS=tuple(os.getenv("CORS_METHODS", "*").split(",")),
+        CORS_HEADERS=tuple(os.getenv("CORS_HEADERS", "*").split(",")),
+        DEBUG=os.getenv("DEBUG", "False").lower() == "true",
+    )
@@ -1,14 +1,15 @@
 """Database configuration for PDF Service"""
 
-from sqlalchemy import create_engine, Column, String, DateTime, LargeBinary, Index
+from sqlalchemy import create_engine, Column, String, BigInteger, DateTime, LargeBinary, Index, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import declarative_base, sessionmaker
-from datetime import datetime, timezone
 import uuid
-from config import DATABASE_URL
+from config import get_settings
 
-if DATABASE_URL:
-    engine = create_engine(DATABASE_URL)
+settings = get_settings()
+
+if settings.DATABASE_URL:
+    engine = create_engine(settings.DATABASE_URL)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 else:
     engine = None
@@ -21,12 +22,12 @@ class PDFDocument(Base):
     __tablename__ = "pdf_documents"
 
     pdf_id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    owner_user_id = Column(PG_UUID(as_uuid=True), nullable=False, index=True)
-    related_goal_id = Column(PG_UUID(as_uuid=True), nullable=True, index=True)
+    owner_user_id = Column(PG_UUID(as_uuid=True), nullable=False)
+    related_goal_id = Column(PG_UUID(as_uuid=True), nullable=True)
     document_type = Column(String(50), nullable=False)  
     file_path = Column(String(500), nullable=True)
-    file_size = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    file_size = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     __table_args__ = (
         Index('idx_pdf_owner', 'owner_user_id'),
@@ -1,10 +1,14 @@
 """Entries Service Client"""
 
 import httpx
+import orjson
 from uuid import UUID
-from config import ENTRIES_SERVICE_URL
+from config import get_settings
+from http_clients import get_http_client
 from fastapi import HTTPException, status
 
+settings = get_settings()
+
 async def get_user_time_stats(token: str) -> dict:
     """
     Fetch user time statistics from Entries Service
@@ -19,21 +23,20 @@ async def get_user_time_stats(token: str) -> dict:
         HTTPException: If request fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{ENTRIES_SERVICE_URL}/api/entries/summary",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {
-                    "total_hours": 0,
-                    "total_entries": 0,
-                    "by_goal": []
-                }
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.ENTRIES_SERVICE_URL}/api/entries/summary",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        else:
+            return {
+                "total_hours": 0,
+                "total_entries": 0,
+                "by_goal": []
+            }
     
     except (httpx.RequestError, httpx.TimeoutException):
         return {
@@ -54,20 +57,19 @@ async def get_goal_total_hours(goal_id: UUID, token: str) -> dict:
         Goal time statistics
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{ENTRIES_SERVICE_URL}/api/entries/goal/{goal_id}/total",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {
-                    "total_hours": 0,
-                    "total_minutes": 0
-                }
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.ENTRIES_SERVICE_URL}/api/entries/goal/{goal_id}/total",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        else:
+            return {
+                "total_hours": 0,
+                "total_minutes": 0
+            }
     
     except (httpx.RequestError, httpx.TimeoutException):
         return {
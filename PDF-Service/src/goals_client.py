@@ -1,10 +1,14 @@
 """Goals Service Client"""
 
 import httpx
+import orjson
 from uuid import UUID
-from config import GOALS_SERVICE_URL
+from config import get_settings
+from http_clients import get_http_client
 from fastapi import HTTPException, status
 
+settings = get_settings()
+
 async def get_user_goals(token: str) -> list:
     """
     Fetch all goals for the current user from Goals Service
@@ -19,21 +23,20 @@ async def get_user_goals(token: str) -> list:
         HTTPException: If request fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GOALS_SERVICE_URL}/api/goals?page_size=1000",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.GOALS_SERVICE_URL}/api/goals?page_size=1000",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            return data.get("goals", [])
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Goals Service error: {response.status_code}"
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("goals", [])
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Goals Service error: {response.status_code}"
-                )
     
     except httpx.RequestError as e:
         raise HTTPException(
@@ -61,25 +64,24 @@ async def get_goal_by_id(goal_id: UUID, token: str) -> dict:
         HTTPException: If request fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{GOALS_SERVICE_URL}/api/goals/{goal_id}",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.GOALS_SERVICE_URL}/api/goals/{goal_id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        elif response.status_code == 404:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Goal not found"
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Goals Service error: {response.status_code}"
             )
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Goal not found"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Goals Service error: {response.status_code}"
-                )
     
     except httpx.RequestError as e:
         raise HTTPException(
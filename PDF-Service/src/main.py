@@ -3,28 +3,23 @@ PDF Microservice
 A FastAPI based PDF generation service that creates reports.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, status, Query, Header, Response
 from sqlalchemy.exc import SQLAlchemyError
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from uuid import UUID
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 import os
+import time
 from io import BytesIO
 
-from config import (
-    CORS_ORIGINS,
-    CORS_CREDENTIALS,
-    CORS_METHODS,
-    CORS_HEADERS,
-    HOST,
-    PORT,
-    DEBUG,
-    PDF_STORAGE_PATH
-)
+from config import get_settings
 
-from auth import get_current_user, extract_token
+from auth import get_user_and_token
 
 from schemas import (
     PDFResponse,
@@ -37,11 +32,23 @@ from goals_client import get_user_goals, get_goal_by_id
 from entries_client import get_user_time_stats, get_goal_total_hours
 
 from pdf_generator import generate_goal_report_pdf, generate_goal_specific_pdf
+from http_clients import get_http_client, close_http_client
+from pdf_cache import pdf_cache_key, get_cached_pdf, cache_pdf
 #from database import get_db
 
+settings = get_settings()
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+PDF_STORAGE_CLEANUP_INTERVAL = 3600
+
+storage_cleanup_running = False
+
+# Dedicated pool so CPU-bound renders are bounded and do not compete with other to_thread work
+pdf_executor = ThreadPoolExecutor(max_workers=settings.PDF_RENDER_WORKERS, thread_name_prefix="pdf-render")
+
 app = FastAPI(
     title="PDF Service",
     description="""PDF generation service for Trackify reports and exports.
@@ -60,7 +67,7 @@ app = FastAPI(
     - **Monthly Reports**: Time-based reporting for specific periods
     
     **Output Options**:
-    - Download as file (saved to server)
+    - Download as file (optionally saved to server with `save=true`)
     - Stream directly (no server storage)
     
     All endpoints require JWT authentication via Bearer token.
@@ -80,13 +87,133 @@ app = FastAPI(
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=CORS_ORIGINS,
-    allow_credentials=CORS_CREDENTIALS,
-    allow_methods=CORS_METHODS,
-    allow_headers=CORS_HEADERS,
+    allow_origins=settings.CORS_ORIGINS,
+    allow_credentials=settings.CORS_CREDENTIALS,
+    allow_methods=settings.CORS_METHODS,
+    allow_headers=settings.CORS_HEADERS,
 )
 
-os.makedirs(PDF_STORAGE_PATH, exist_ok=True)
+def remove_expired_pdfs(max_age_seconds: float) -> int:
+    """Delete saved PDFs older than max_age_seconds from PDF_STORAGE_PATH and return how many were removed"""
+    if not os.path.isdir(settings.PDF_STORAGE_PATH):
+        return 0
+    
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    with os.scandir(settings.PDF_STORAGE_PATH) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".pdf") and entry.stat().st_mtime < cutoff:
+                try:
+                    os.unlink(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+    return removed
+
+async def clean_pdf_storage():
+    """Background task that periodically removes saved PDFs past the retention period"""
+    global storage_cleanup_running
+    storage_cleanup_running = True
+    
+    while storage_cleanup_running:
+        try:
+            removed = await asyncio.to_thread(remove_expired_pdfs, settings.PDF_STORAGE_RETENTION_MINUTES * 60)
+            if removed:
+                logger.info("Removed %s expired PDFs from %s", removed, settings.PDF_STORAGE_PATH)
+        except Exception as e:
+            logger.error(f"Error cleaning PDF storage: {str(e)}")
+        await asyncio.sleep(PDF_STORAGE_CLEANUP_INTERVAL)
+
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared HTTP client and start the PDF storage cleanup task when a retention period is configured"""
+    get_http_client()
+    if settings.PDF_STORAGE_RETENTION_MINUTES > 0:
+        asyncio.create_task(clean_pdf_storage())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the storage cleanup task and close the shared HTTP client on shutdown"""
+    global storage_cleanup_running
+    storage_cleanup_running = False
+    await close_http_client()
+
+def pdf_download_response(pdf_bytes: bytes, filename: str, save: bool = False, etag: Optional[str] = None) -> Response:
+    """Return PDF bytes as a file download, optionally keeping a copy in PDF_STORAGE_PATH"""
+    if save:
+        os.makedirs(settings.PDF_STORAGE_PATH, exist_ok=True)
+        with open(os.path.join(settings.PDF_STORAGE_PATH, filename), 'wb') as f:
+            f.write(pdf_bytes)
+    
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if etag:
+        headers["ETag"] = etag
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against a report ETag"""
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") in (opaque_tag, "*") for tag in if_none_match.split(","))
+
+async def render_pdf(generator, *args) -> bytes:
+    """Run a synchronous PDF generator on the render pool without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(pdf_executor, generator, *args)
+
+async def build_full_report(current_user: str, token: str, if_none_match: Optional[str] = None) -> tuple[Optional[bytes], str]:
+    """
+    Fetch the user, goals and time stats concurrently and render the full report PDF.
+    Returns the PDF bytes and the report ETag, which is derived from the fetched data.
+    The bytes are None when if_none_match already matches, so nothing is rendered.
+    """
+    user_data, goals, entries_stats = await asyncio.gather(
+        get_user_data(current_user, token),
+        get_user_goals(token),
+        get_user_time_stats(token)
+    )
+    
+    cache_key = pdf_cache_key("report", current_user, user_data, goals, entries_stats)
+    etag = f'W/"{cache_key}"'
+    if etag_matches(if_none_match, etag):
+        return None, etag
+    
+    pdf_bytes = get_cached_pdf(cache_key)
+    if pdf_bytes is None:
+        pdf_bytes = await render_pdf(generate_goal_report_pdf, user_data, goals, entries_stats)
+        cache_pdf(cache_key, pdf_bytes)
+    return pdf_bytes, etag
+
+async def build_goal_report(goal_id: UUID, current_user: str, token: str) -> tuple[bytes, dict]:
+    """
+    Fetch the goal, user and goal hours concurrently and render the goal PDF.
+    Returns the PDF bytes and the goal data (used for the filename).
+    """
+    goal_data, user_data, goal_hours = await asyncio.gather(
+        get_goal_by_id(goal_id, token),
+        get_user_data(current_user, token),
+        get_goal_total_hours(goal_id, token)
+    )
+    logger.debug("Fetched goal=%s user=%s hours=%s", goal_data, user_data, goal_hours)
+    
+    cache_key = pdf_cache_key("goal", goal_id, current_user, goal_data, user_data, goal_hours)
+    pdf_bytes = get_cached_pdf(cache_key)
+    if pdf_bytes is None:
+        pdf_bytes = await render_pdf(generate_goal_specific_pdf, goal_data, user_data, goal_hours)
+        logger.debug("PDF bytes generated len=%s", 0 if pdf_bytes is None else len(pdf_bytes))
+        
+        if pdf_bytes is None:
+            raise ValueError("PDF generation returned None")
+        cache_pdf(cache_key, pdf_bytes)
+    return pdf_bytes, goal_data
+
+def iter_pdf_chunks(pdf_bytes: bytes, chunk_size: int = PDF_STREAM_CHUNK_SIZE):
+    """
+    Yield PDF bytes in fixed-size slices so the response starts writing before the whole file is sent.
+    Slices are bytes, not memoryviews, since older Starlette releases call .encode() on anything else.
+    """
+    for start in range(0, len(pdf_bytes), chunk_size):
+        yield pdf_bytes[start:start + chunk_size]
 
 # =====================================================
 # HEALTH CHECK ENDPOINTS
@@ -99,7 +226,7 @@ async def health_check():
     """
     return HealthResponse(status="healthy")
 
-@app.get("/api/pdf/health/readiness")
+@app.get("/api/pdf/health/readiness", response_model=HealthResponse, tags=["Health"])
 async def readiness():
     """
     Readiness health check. Confirms the service actually works. PDF does not have a DB.
@@ -112,7 +239,7 @@ async def readiness():
 
 @app.get(
     "/api/pdf/report",
-    response_class=FileResponse,
+    response_class=Response,
     tags=["PDF Reports"],
     summary="Generate Full Report (Download)",
     response_description="PDF file download",
@@ -128,13 +255,15 @@ async def readiness():
                 }
             }
         },
+        304: {"description": "Report data unchanged since the ETag sent in If-None-Match"},
         401: {"description": "Unauthorized"},
         500: {"description": "Failed to generate report"}
     }
 )
 async def generate_full_report(
-    current_user: str = Depends(get_current_user),
-    token: str = Depends(extract_token)
+    save: bool = Query(False, description="Also keep a copy of the PDF in server storage"),
+    if_none_match: Optional[str] = Header(None),
+    user_and_token: tuple[str, str] = Depends(get_user_and_token)
 ):
     """
     Generate a comprehensive PDF report with all user data and goals.
@@ -153,9 +282,11 @@ async def generate_full_report(
     - Entries Service: Time tracking data and statistics
     
     **File Handling**:
-    - PDF saved to server storage
     - Returned as downloadable file
+    - Saved to server storage only when `save=true`
     - Filename includes timestamp for uniqueness
+    - Response carries an `ETag`; sending it back in `If-None-Match` returns
+      `304 Not Modified` while the underlying data is unchanged
     
     **Use Cases**:
     - Export complete user data
@@ -165,27 +296,17 @@ async def generate_full_report(
     
     **Authentication**: Required (Bearer token)
     """
+    current_user, token = user_and_token
     try:
-        user_data = await get_user_data(current_user, token)
-        goals = await get_user_goals(token)
-        entries_stats = await get_user_time_stats(token)
-        
-        pdf_bytes = generate_goal_report_pdf(user_data, goals, entries_stats)
+        pdf_bytes, etag = await build_full_report(current_user, token, None if save else if_none_match)
+        if pdf_bytes is None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"trackify_report_{timestamp}.pdf"
-        filepath = os.path.join(PDF_STORAGE_PATH, filename)
+        logger.info("Report PDF generated: %s for user %s", filename, current_user)
         
-        with open(filepath, 'wb') as f:
-            f.write(pdf_bytes)
-        
-        logger.info(f"Report PDF generated: {filename} for user {current_user}")
-        
-        return FileResponse(
-            path=filepath,
-            media_type="application/pdf",
-            filename=filename
-        )
+        return pdf_download_response(pdf_bytes, filename, save, etag)
     
     except HTTPException:
         raise
@@ -219,8 +340,7 @@ async def generate_full_report(
     }
 )
 async def generate_full_report_stream(
-    current_user: str = Depends(get_current_user),
-    token: str = Depends(extract_token)
+    user_and_token: tuple[str, str] = Depends(get_user_and_token)
 ):
     """
     Generate and stream a comprehensive PDF report directly to client.
@@ -245,17 +365,14 @@ async def generate_full_report_stream(
     
     **Authentication**: Required (Bearer token)
     """
+    current_user, token = user_and_token
     try:
-        user_data = await get_user_data(current_user, token)
-        goals = await get_user_goals(token)
-        entries_stats = await get_user_time_stats(token)
+        pdf_bytes, _ = await build_full_report(current_user, token)
         
-        pdf_bytes = generate_goal_report_pdf(user_data, goals, entries_stats)
-        
-        logger.info(f"Report PDF streamed for user {current_user}")
+        logger.info("Report PDF streamed for user %s", current_user)
         
         return StreamingResponse(
-            iter([pdf_bytes]),
+            iter_pdf_chunks(pdf_bytes),
             media_type="application/pdf",
             headers={"Content-Disposition": "attachment; filename=trackify_report.pdf"}
         )
@@ -271,7 +388,7 @@ async def generate_full_report_stream(
 
 @app.get(
     "/api/pdf/goal/{goal_id}",
-    response_class=FileResponse,
+    response_class=Response,
     tags=["PDF Reports"],
     summary="Generate Goal Report (Download)",
     response_description="PDF file download for specific goal",
@@ -294,8 +411,8 @@ async def generate_full_report_stream(
 )
 async def generate_goal_pdf(
     goal_id: UUID,
-    current_user: str = Depends(get_current_user),
-    token: str = Depends(extract_token)
+    save: bool = Query(False, description="Also keep a copy of the PDF in server storage"),
+    user_and_token: tuple[str, str] = Depends(get_user_and_token)
 ):
     """
     Generate a detailed PDF report for a specific goal.
@@ -326,41 +443,16 @@ async def generate_goal_pdf(
     
     **Authentication**: Required (Bearer token)
     """
+    current_user, token = user_and_token
     try:
-        goal_data = await get_goal_by_id(goal_id, token)
-        logger.info(f"Goal data fetched: {goal_data}")
-        
-        user_data = await get_user_data(current_user, token)
-        logger.info(f"User data fetched: {user_data}")
-        
-        goal_hours = await get_goal_total_hours(goal_id, token)
-        logger.info(f"Goal hours fetched: {goal_hours}")
-        
-        try:
-            pdf_bytes = generate_goal_specific_pdf(goal_data, user_data, goal_hours)
-            logger.info(f"PDF bytes generated, type: {type(pdf_bytes)}, is None: {pdf_bytes is None}, length: {len(pdf_bytes) if pdf_bytes else 0}")
-        except Exception as pdf_gen_error:
-            logger.error(f"PDF generation error: {pdf_gen_error}", exc_info=True)
-            raise
-        
-        if pdf_bytes is None:
-            raise ValueError("PDF generation returned None")
+        pdf_bytes, goal_data = await build_goal_report(goal_id, current_user, token)
         
         goal_title = goal_data.get('title', 'goal').replace(' ', '_').lower()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"goal_{goal_title}_{timestamp}.pdf"
-        filepath = os.path.join(PDF_STORAGE_PATH, filename)
-        
-        with open(filepath, 'wb') as f:
-            f.write(pdf_bytes)
-        
-        logger.info(f"Goal PDF generated: {filename} for user {current_user}")
+        logger.info("Goal PDF generated: %s for user %s", filename, current_user)
         
-        return FileResponse(
-            path=filepath,
-            media_type="application/pdf",
-            filename=filename
-        )
+        return pdf_download_response(pdf_bytes, filename, save)
     
     except HTTPException:
         raise
@@ -396,8 +488,7 @@ async def generate_goal_pdf(
 )
 async def generate_goal_pdf_stream(
     goal_id: UUID,
-    current_user: str = Depends(get_current_user),
-    token: str = Depends(extract_token)
+    user_and_token: tuple[str, str] = Depends(get_user_and_token)
 ):
     """
     Generate and stream a PDF report for a specific goal.
@@ -423,27 +514,15 @@ async def generate_goal_pdf_stream(
     
     **Authentication**: Required (Bearer token)
     """
+    current_user, token = user_and_token
     try:
-        goal_data = await get_goal_by_id(goal_id, token)
-        logger.info(f"Goal data fetched for streaming: {goal_data}")
-        
-        user_data = await get_user_data(current_user, token)
-        logger.info(f"User data fetched for streaming: {user_data}")
-        
-        goal_hours = await get_goal_total_hours(goal_id, token)
-        logger.info(f"Goal hours fetched for streaming: {goal_hours}")
-        
-        pdf_bytes = generate_goal_specific_pdf(goal_data, user_data, goal_hours)
-        logger.info(f"PDF bytes generated for streaming, type: {type(pdf_bytes)}, is None: {pdf_bytes is None}")
-        
-        if pdf_bytes is None:
-            raise ValueError("PDF generation returned None")
+        pdf_bytes, goal_data = await build_goal_report(goal_id, current_user, token)
         
-        logger.info(f"Goal PDF streamed for user {current_user}, goal {goal_id}")
+        logger.info("Goal PDF streamed for user %s, goal %s", current_user, goal_id)
         
         goal_title = goal_data.get('title', 'goal').replace(' ', '_').lower()
         return StreamingResponse(
-            iter([pdf_bytes]),
+            iter_pdf_chunks(pdf_bytes),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename=goal_{goal_title}.pdf"}
         )
@@ -459,7 +538,7 @@ async def generate_goal_pdf_stream(
 
 @app.post(
     "/api/pdf/generate",
-    response_class=FileResponse,
+    response_class=Response,
     tags=["PDF Reports"],
     summary="Generate Comprehensive PDF (POST)",
     response_description="PDF file download",
@@ -480,8 +559,8 @@ async def generate_goal_pdf_stream(
     }
 )
 async def generate_pdf(
-    current_user: str = Depends(get_current_user),
-    token: str = Depends(extract_token)
+    save: bool = Query(False, description="Also keep a copy of the PDF in server storage"),
+    user_and_token: tuple[str, str] = Depends(get_user_and_token)
 ):
     """
     Generate a comprehensive PDF report with all user data and goals (POST method).
@@ -508,27 +587,15 @@ async def generate_pdf(
     
     **Authentication**: Required (Bearer token)
     """
+    current_user, token = user_and_token
     try:
-        user_data = await get_user_data(current_user, token)
-        goals = await get_user_goals(token)
-        entries_stats = await get_user_time_stats(token)
-        
-        pdf_bytes = generate_goal_report_pdf(user_data, goals, entries_stats)
+        pdf_bytes, _ = await build_full_report(current_user, token)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"trackify_report_{timestamp}.pdf"
-        filepath = os.path.join(PDF_STORAGE_PATH, filename)
-        
-        with open(filepath, 'wb') as f:
-            f.write(pdf_bytes)
+        logger.info("Comprehensive PDF generated: %s for user %s", filename, current_user)
         
-        logger.info(f"Comprehensive PDF generated: {filename} for user {current_user}")
-        
-        return FileResponse(
-            path=filepath,
-            media_type="application/pdf",
-            filename=filename
-        )
+        return pdf_download_response(pdf_bytes, filename, save)
     
     except HTTPException:
         raise
@@ -541,4 +608,4 @@ async def generate_pdf(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=HOST, port=PORT)
+    uvicorn.run(app, host=settings.HOST, port=settings.PORT)
@@ -0,0 +1,28 @@
+"""In-process cache of rendered goal PDFs"""
+
+import hashlib
+import json
+from typing import Optional
+from cachetools import TTLCache
+from config import get_settings
+
+settings = get_settings()
+
+pdf_cache = TTLCache(maxsize=settings.PDF_CACHE_SIZE, ttl=settings.PDF_CACHE_TTL)
+
+def pdf_cache_key(*parts) -> str:
+    """
+    Build a cache key from the report inputs.
+    Any change in the upstream data produces a different key, so entries never go stale.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def get_cached_pdf(key: str) -> Optional[bytes]:
+    """Return cached PDF bytes, or None on a miss"""
+    return pdf_cache.get(key)
+
+def cache_pdf(key: str, pdf_bytes: bytes) -> None:
+    """Store rendered PDF bytes for PDF_CACHE_TTL seconds"""
+    if settings.PDF_CACHE_TTL > 0:
+        pdf_cache[key] = pdf_bytes
@@ -3,157 +3,315 @@
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Frame
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, Frame
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from datetime import datetime
-from io import BytesIO
 from uuid import UUID
 from decimal import Decimal
+from typing import Callable
 import logging
 
-def generate_goal_report_pdf(user_data: dict, goals: list, entries_stats: dict) -> bytes:
+logger = logging.getLogger(__name__)
+
+COLOR_EMERALD = colors.HexColor('#10b981')
+COLOR_VIOLET = colors.HexColor('#8b5cf6')
+COLOR_LIGHT_GREY = colors.HexColor('#f3f4f6')
+COLOR_BLUE = colors.HexColor('#3b82f6')
+COLOR_SLATE = colors.HexColor('#1f2937')
+COLOR_DIVIDER = colors.HexColor('#cccccc')
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+PAGE_SIDE_MARGIN = inch
+PAGE_TOP_MARGIN = 1.5*inch
+PAGE_BOTTOM_MARGIN = 0.5*inch
+
+STYLES = getSampleStyleSheet()
+
+REPORT_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=STYLES['Heading1'],
+    fontSize=24,
+    textColor=COLOR_SLATE,
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+GOAL_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=STYLES['Heading1'],
+    fontSize=20,
+    textColor=COLOR_SLATE,
+    spaceAfter=20,
+    alignment=TA_LEFT
+)
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), COLOR_EMERALD),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COLOR_LIGHT_GREY]),
+])
+
+REPORT_GOAL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), COLOR_VIOLET),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COLOR_LIGHT_GREY]),
+])
+
+GOAL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), COLOR_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COLOR_LIGHT_GREY]),
+])
+
+def _s(value, default: str = 'N/A') -> str:
+    """Return a table cell string, passing strings through without conversion"""
+    if isinstance(value, str):
+        return value
+    return default if value is None else str(value)
+
+def _num(value, default: float = 0.0) -> float:
+    """Return a float, accepting the decimal strings the other services serialize"""
+    if isinstance(value, float):
+        return value
+    if value is None or value == '':
+        return default
+    return float(value)
+
+def _make_header_drawer(user_data: dict) -> Callable:
     """
-    Generate a comprehensive PDF report with user data and all goals
-    
-    Args:
-        user_data: User information
-        goals: List of goal objects
-        entries_stats: Time entry statistics
-    
-    Returns:
-        PDF bytes
+    Return the page callback that draws the user's details in the top right corner.
+    The header lines are formatted once here rather than on every page.
     """
-    logger = logging.getLogger(__name__)
-    logger.info(f"Starting comprehensive goal report PDF generation - User: {user_data.get('google_email', 'N/A')}, Goals count: {len(goals)}, Stats: {entries_stats}")
-    
-    pdf_buffer = BytesIO()
-    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, topMargin=1.5*inch, bottomMargin=0.5*inch)
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    total_money_earned = 0
-    for goal in goals:
-        hourly_rate = float(goal.get('hourly_rate', 0) or 0)
-        goal_id = goal.get('goal_id')
-        if goal_id and goal_id in entries_stats.get('goals_hours', {}):
-            hours = entries_stats['goals_hours'][goal_id]
-            total_money_earned += hourly_rate * hours
+    header_lines = [
+        user_data.get('full_name') or 'N/A',
+        user_data.get('google_email') or 'N/A',
+        user_data.get('country') or 'N/A',
+    ]
+    if user_data.get('phone'):
+        header_lines.append(user_data['phone'])
+    header_lines.append(f"Currency: {user_data.get('currency') or 'N/A'}")
+    line_offset = 15 * len(header_lines)
     
     def draw_header(canvas, doc):
         canvas.saveState()
         
-        right_margin = doc.width + doc.leftMargin
-        top = doc.height + doc.bottomMargin + 0.5*inch
+        right_margin = PAGE_WIDTH - PAGE_SIDE_MARGIN
+        top = PAGE_HEIGHT - PAGE_TOP_MARGIN + 0.5*inch
         
         canvas.setFont("Helvetica-Bold", 10)
-        canvas.drawRightString(right_margin, top, user_data.get('full_name') or 'N/A')
+        canvas.drawRightString(right_margin, top, header_lines[0])
         
         canvas.setFont("Helvetica", 9)
-        canvas.drawRightString(right_margin, top - 15, user_data.get('google_email') or 'N/A')
-        canvas.drawRightString(right_margin, top - 30, user_data.get('country') or 'N/A')
-        if user_data.get('phone'):
-            canvas.drawRightString(right_margin, top - 45, user_data.get('phone') or 'N/A')
-            canvas.drawRightString(right_margin, top - 60, f"Currency: {user_data.get('currency') or 'N/A'}")
-            line_offset = 75
-        else:
-            canvas.drawRightString(right_margin, top - 45, f"Currency: {user_data.get('currency') or 'N/A'}")
-            line_offset = 60
+        for i in range(1, len(header_lines)):
+            canvas.drawRightString(right_margin, top - 15 * i, header_lines[i])
         
-        canvas.setStrokeColor(colors.HexColor('#cccccc'))
+        canvas.setStrokeColor(COLOR_DIVIDER)
         canvas.setLineWidth(0.5)
         canvas.line(right_margin - 150, top - line_offset, right_margin, top - line_offset)
         
         canvas.restoreState()
     
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f2937'),
-        spaceAfter=30,
-        alignment=TA_CENTER
+    return draw_header
+
+def _flowables_height(flowables: list) -> float:
+    """Return the height the flowables take up in the page frame, including their spacing"""
+    frame_width = PAGE_WIDTH - 2*PAGE_SIDE_MARGIN
+    return sum(
+        f.wrap(frame_width, PAGE_HEIGHT)[1] + f.getSpaceBefore() + f.getSpaceAfter()
+        for f in flowables
+    )
+
+def _render_pdf(elements: list, user_data: dict) -> bytes:
+    """
+    Lay out the report flowables straight onto a canvas with the user header on
+    every page, without SimpleDocTemplate's page machinery.
+    A nested list is a section that starts on a new page when it does not fit the
+    rest of the current one but fits a whole page; taller sections split in place.
+    Returns the PDF bytes directly instead of writing them to a buffer.
+    """
+    draw_header = _make_header_drawer(user_data)
+    pdf_canvas = canvas.Canvas(None, pagesize=letter)
+    while elements:
+        placed = 0
+        draw_header(pdf_canvas, None)
+        frame = Frame(
+            PAGE_SIDE_MARGIN,
+            PAGE_BOTTOM_MARGIN,
+            PAGE_WIDTH - 2*PAGE_SIDE_MARGIN,
+            PAGE_HEIGHT - PAGE_TOP_MARGIN - PAGE_BOTTOM_MARGIN
+        )
+        page_height = frame._y - frame._y1p
+        while elements:
+            if isinstance(elements[0], list):
+                section_height = _flowables_height(elements[0])
+                if placed and frame._y - frame._y1p < section_height <= page_height:
+                    break
+                elements[0:1] = elements[0]
+                continue
+            if frame.add(elements[0], pdf_canvas, trySplit=1):
+                del elements[0]
+                placed += 1
+                continue
+            # Split a flowable that overflows the page (e.g. a long table) and carry the rest over
+            parts = frame.split(elements[0], pdf_canvas)
+            if parts and frame.add(parts[0], pdf_canvas, trySplit=0):
+                elements[0:1] = parts[1:]
+                placed += 1
+            break
+        pdf_canvas.showPage()
+        if not placed:
+            raise ValueError("PDF content does not fit on a page")
+    return pdf_canvas.getpdfdata()
+
+def _build_summary_section(user_data: dict, goals: list, entries_stats: dict) -> list:
+    """Build the title and summary statistics table of the full report"""
+    goals_hours = entries_stats.get('goals_hours') or {}
+    total_money_earned = sum(
+        _num(goal.get('hourly_rate')) * _num(goals_hours.get(goal.get('goal_id')))
+        for goal in goals
     )
-    elements.append(Paragraph("Trackify Goals Report", title_style))
-    elements.append(Spacer(1, 0.2*inch))
-    
-    elements.append(Paragraph("Summary Statistics", styles['Heading2']))
-    elements.append(Spacer(1, 0.1*inch))
     
-    total_hours = entries_stats.get('total_hours', 0)
+    total_hours = _num(entries_stats.get('total_hours'))
     total_entries = entries_stats.get('total_entries', 0)
     currency = user_data.get('currency') or 'USD'
     
-    summary_data = [
-        ['Metric', 'Value'],
-        ['Total Goals', str(len(goals))],
-        ['Total Hours Logged', f"{total_hours:.1f} hours"],
-        ['Total Entries', str(total_entries)],
-        ['Total Money Earned', f"{currency} {total_money_earned:,.2f}"],
-        ['Report Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-    ]
+    summary_data = (
+        ('Metric', 'Value'),
+        ('Total Goals', str(len(goals))),
+        ('Total Hours Logged', f"{total_hours:.1f} hours"),
+        ('Total Entries', str(total_entries)),
+        ('Total Money Earned', f"{currency} {total_money_earned:,.2f}"),
+        ('Report Generated', datetime.now().isoformat(sep=' ', timespec='seconds')),
+    )
     
     summary_table = Table(summary_data, colWidths=[2*inch, 4*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
-    ]))
-    elements.append(summary_table)
-    elements.append(Spacer(1, 0.3*inch))
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
+    
+    return [
+        Paragraph("Trackify Goals Report", REPORT_TITLE_STYLE),
+        Spacer(1, 0.2*inch),
+        Paragraph("Summary Statistics", STYLES['Heading2']),
+        Spacer(1, 0.1*inch),
+        summary_table,
+        Spacer(1, 0.3*inch),
+    ]
+
+def _build_goal_section(idx: int, goal: dict) -> list:
+    """Build the heading, details table and spacing for one goal in the full report"""
+    goal_heading = f"Goal {idx}: {goal.get('title', 'Untitled')}"
+    description = goal.get('description') or 'No description provided'
+    if len(description) > 100:
+        description = description[:100]
+    
+    goal_details = (
+        ('Attribute', 'Value'),
+        ('Title', goal.get('title', 'N/A')),
+        ('Target Hours', _s(goal.get('target_hours'))),
+        ('Hourly Rate', f"${goal.get('hourly_rate', 0)}" if goal.get('hourly_rate') else 'N/A'),
+        ('Start Date', _s(goal.get('start_date'))),
+        ('End Date', _s(goal.get('end_date'))),
+        ('Description', description),
+    )
+    
+    goal_table = Table(goal_details, colWidths=[2*inch, 4*inch])
+    goal_table.setStyle(REPORT_GOAL_TABLE_STYLE)
+    
+    # Returned as one section so _render_pdf moves the goal to a new page instead of splitting its table
+    return [Paragraph(goal_heading, STYLES['Heading3']), goal_table, Spacer(1, 0.2*inch)]
+
+def _build_goal_detail_section(goal_data: dict, user_data: dict, goal_hours: dict) -> list:
+    """Build the title, details table and footer of the single-goal report"""
+    total_hours = _num(goal_hours.get('total_hours'))
+    hourly_rate = _num(goal_data.get('hourly_rate'))
+    money_earned = total_hours * hourly_rate
+    currency = user_data.get('currency') or 'USD'
+    
+    goal_title = goal_data.get('title') or 'Goal Report'
+    
+    target_hours = _num(goal_data.get('target_hours'))
+    progress = (total_hours / target_hours * 100) if target_hours else 0
+    
+    description = goal_data.get('description') or 'N/A'
+    if len(description) > 80:
+        description = description[:80]
+    
+    goal_details = (
+        ('Field', 'Value'),
+        ('Title', goal_data.get('title', 'N/A')),
+        ('Description', description),
+        ('Target Hours', _s(goal_data.get('target_hours'), '0')),
+        ('Hours Completed', f"{total_hours:.1f}"),
+        ('Progress', f"{progress:.1f}%"),
+        ('Hourly Rate', f"{currency} {hourly_rate:.2f}"),
+        ('Money Earned', f"{currency} {money_earned:,.2f}"),
+        ('Start Date', _s(goal_data.get('start_date'))),
+        ('End Date', _s(goal_data.get('end_date'))),
+    )
     
-    elements.append(Paragraph("Goals Details", styles['Heading2']))
+    goal_table = Table(goal_details, colWidths=[2*inch, 4*inch])
+    goal_table.setStyle(GOAL_TABLE_STYLE)
+    
+    now = datetime.now()
+    footer_text = f"Generated on {now.date().isoformat()} at {now.time().isoformat(timespec='seconds')}"
+    
+    return [
+        Paragraph(f"Goal: {goal_title}", GOAL_TITLE_STYLE),
+        Spacer(1, 0.1*inch),
+        goal_table,
+        Spacer(1, 0.3*inch),
+        Spacer(1, 0.2*inch),
+        Paragraph(footer_text, STYLES['Normal']),
+    ]
+
+def generate_goal_report_pdf(user_data: dict, goals: list, entries_stats: dict) -> bytes:
+    """
+    Generate a comprehensive PDF report with user data and all goals
+    
+    Args:
+        user_data: User information
+        goals: List of goal objects
+        entries_stats: Time entry statistics
+    
+    Returns:
+        PDF bytes
+    """
+    logger.info("Starting comprehensive goal report PDF generation - User: %s, Goals count: %d", user_data.get('google_email', 'N/A'), len(goals))
+    logger.debug("Report stats: %s", entries_stats)
+    
+    elements = _build_summary_section(user_data, goals, entries_stats)
+    elements.append(Paragraph("Goals Details", STYLES['Heading2']))
     elements.append(Spacer(1, 0.1*inch))
     
     if goals:
         for idx, goal in enumerate(goals, 1):
-            goal_heading = f"Goal {idx}: {goal.get('title', 'Untitled')}"
-            elements.append(Paragraph(goal_heading, styles['Heading3']))
-            
-            goal_details = [
-                ['Attribute', 'Value'],
-                ['Title', goal.get('title', 'N/A')],
-                ['Target Hours', str(goal.get('target_hours', 'N/A'))],
-                ['Hourly Rate', f"${goal.get('hourly_rate', 0)}" if goal.get('hourly_rate') else 'N/A'],
-                ['Start Date', str(goal.get('start_date', 'N/A'))],
-                ['End Date', str(goal.get('end_date', 'N/A'))],
-                ['Description', goal.get('description', 'No description provided')[:100]],
-            ]
-            
-            goal_table = Table(goal_details, colWidths=[2*inch, 4*inch])
-            goal_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8b5cf6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
-            ]))
-            elements.append(goal_table)
-            elements.append(Spacer(1, 0.2*inch))
-            
-            if idx % 3 == 0 and idx < len(goals):
-                elements.append(PageBreak())
+            elements.append(_build_goal_section(idx, goal))
     else:
-        elements.append(Paragraph("No goals found.", styles['Normal']))
+        elements.append(Paragraph("No goals found.", STYLES['Normal']))
     
     try:
         logger.info("Building comprehensive goal report PDF document...")
-        doc.build(elements, onFirstPage=draw_header, onLaterPages=draw_header)
-        pdf_buffer.seek(0)
-        result = pdf_buffer.getvalue()
-        logger.info(f"Comprehensive goal report PDF generated successfully, size: {len(result)} bytes")
+        result = _render_pdf(elements, user_data)
+        logger.info("Comprehensive goal report PDF generated successfully, size: %d bytes", len(result))
         return result
     except Exception as e:
         logger.error(f"Error building comprehensive goal report PDF document: {e}", exc_info=True)
@@ -171,115 +329,15 @@ def generate_goal_specific_pdf(goal_data: dict, user_data: dict, goal_hours: dic
     Returns:
         PDF bytes
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    try:
-        logger.info(f"Starting PDF generation with goal_data type: {type(goal_data)}, user_data type: {type(user_data)}, goal_hours type: {type(goal_hours)}")
-        
-        pdf_buffer = BytesIO()
-        doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, topMargin=1.5*inch, bottomMargin=0.5*inch)
-        
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        total_hours = goal_hours.get('total_hours', 0)
-        hourly_rate = float(goal_data.get('hourly_rate', 0) or 0)
-        money_earned = total_hours * hourly_rate
-        currency = user_data.get('currency') or 'USD'
-    except Exception as e:
-        logger.error(f"Error in PDF generation initialization: {e}", exc_info=True)
-        raise
-    
-    def draw_header(canvas, doc):
-        canvas.saveState()
-        
-        right_margin = doc.width + doc.leftMargin
-        top = doc.height + doc.bottomMargin + 0.5*inch
-        
-        canvas.setFont("Helvetica-Bold", 10)
-        canvas.drawRightString(right_margin, top, user_data.get('full_name') or 'N/A')
-        
-        canvas.setFont("Helvetica", 9)
-        canvas.drawRightString(right_margin, top - 15, user_data.get('google_email') or 'N/A')
-        canvas.drawRightString(right_margin, top - 30, user_data.get('country') or 'N/A')
-        if user_data.get('phone'):
-            canvas.drawRightString(right_margin, top - 45, user_data.get('phone') or 'N/A')
-            canvas.drawRightString(right_margin, top - 60, f"Currency: {user_data.get('currency') or 'N/A'}")
-            line_offset = 75
-        else:
-            canvas.drawRightString(right_margin, top - 45, f"Currency: {user_data.get('currency') or 'N/A'}")
-            line_offset = 60
-        
-        canvas.setStrokeColor(colors.HexColor('#cccccc'))
-        canvas.setLineWidth(0.5)
-        canvas.line(right_margin - 150, top - line_offset, right_margin, top - line_offset)
-        
-        canvas.restoreState()
-    
-    goal_title = goal_data.get('title') or 'Goal Report'
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=20,
-        textColor=colors.HexColor('#1f2937'),
-        spaceAfter=20,
-        alignment=TA_LEFT
-    )
-    elements.append(Paragraph(f"Goal: {goal_title}", title_style))
-    elements.append(Spacer(1, 0.1*inch))
+    logger.debug("Starting goal PDF generation for goal %s", goal_data.get('goal_id'))
     
-    target_hours = goal_data.get('target_hours', 0)
-    progress = (float(total_hours) / float(target_hours) * 100) if target_hours else 0
-    
-    description = goal_data.get('description') or 'N/A'
-    if description != 'N/A':
-        description = description[:80]
-    
-    goal_details = [
-        ['Field', 'Value'],
-        ['Title', goal_data.get('title', 'N/A')],
-        ['Description', description],
-        ['Target Hours', str(target_hours)],
-        ['Hours Completed', f"{total_hours:.1f}"],
-        ['Progress', f"{progress:.1f}%"],
-        ['Hourly Rate', f"{currency} {hourly_rate:.2f}"],
-        ['Money Earned', f"{currency} {money_earned:,.2f}"],
-        ['Start Date', str(goal_data.get('start_date', 'N/A'))],
-        ['End Date', str(goal_data.get('end_date', 'N/A'))],
-    ]
-    
-    goal_table = Table(goal_details, colWidths=[2*inch, 4*inch])
-    goal_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
-    ]))
-    elements.append(goal_table)
-    elements.append(Spacer(1, 0.3*inch))
-    
-    footer_text = f"Generated on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}"
-    elements.append(Spacer(1, 0.2*inch))
-    elements.append(Paragraph(footer_text, styles['Normal']))
+    elements = _build_goal_detail_section(goal_data, user_data, goal_hours)
     
     try:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info("Building PDF document for specific goal...")
-        doc.build(elements, onFirstPage=draw_header, onLaterPages=draw_header)
-        pdf_buffer.seek(0)
-        result = pdf_buffer.getvalue()
-        logger.info(f"PDF generated successfully, size: {len(result)} bytes")
+        result = _render_pdf(elements, user_data)
+        logger.info("PDF generated successfully, size: %d bytes", len(result))
         return result
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Error building PDF document: {e}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
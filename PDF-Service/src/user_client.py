@@ -1,10 +1,14 @@
 """User Service Client"""
 
 import httpx
+import orjson
 from uuid import UUID
-from config import USER_SERVICE_URL
+from config import get_settings
+from http_clients import get_http_client
 from fastapi import HTTPException, status
 
+settings = get_settings()
+
 async def get_user_data(user_id: UUID, token: str) -> dict:
     """
     Fetch user data from User Service
@@ -20,25 +24,24 @@ async def get_user_data(user_id: UUID, token: str) -> dict:
         HTTPException: If request fails
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{USER_SERVICE_URL}/api/users/{user_id}",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=10.0
+        client = get_http_client()
+        response = await client.get(
+            f"{settings.USER_SERVICE_URL}/api/users/{user_id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        elif response.status_code == 404:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"User Service error: {response.status_code}"
             )
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"User Service error: {response.status_code}"
-                )
     
     except httpx.RequestError as e:
         raise HTTPException(
@@ -6,15 +6,20 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, MagicMock
 from uuid import uuid4
+from dataclasses import replace
 from datetime import datetime
 import sys
 import os
 import io
+import re
+import time
+import asyncio
 from sqlalchemy.sql import text
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from main import app
+import main
+from main import app, iter_pdf_chunks, PDF_STREAM_CHUNK_SIZE
 from auth import create_access_token
 from database import engine, Base
 
@@ -167,6 +172,130 @@ def test_generate_full_report_user_service_failure(mock_get_user, test_user):
     assert response.status_code == 500
 
 
+# ============================================================================
+# REPORT ETAG TESTS
+# ============================================================================
+
+def mock_report_sources(mock_get_user, mock_get_goals, mock_get_stats, mock_user_data, mock_goals_data, mock_entries_stats):
+    """Point the full report's upstream calls at the fixture data"""
+    mock_get_user.return_value = mock_user_data
+    mock_get_goals.return_value = mock_goals_data
+    mock_get_stats.return_value = mock_entries_stats
+
+
+@patch('main.cache_pdf')
+@patch('main.get_cached_pdf', return_value=None)
+@patch('main.generate_goal_report_pdf', return_value=b"%PDF-1.4 report")
+@patch('main.get_user_time_stats', new_callable=AsyncMock)
+@patch('main.get_user_goals', new_callable=AsyncMock)
+@patch('main.get_user_data', new_callable=AsyncMock)
+def test_generate_full_report_sets_etag(
+    mock_get_user, mock_get_goals, mock_get_stats, mock_generate_pdf, mock_get_cached, mock_cache,
+    test_user, mock_user_data, mock_goals_data, mock_entries_stats
+):
+    """Test a normal report download carries an ETag"""
+    mock_report_sources(mock_get_user, mock_get_goals, mock_get_stats, mock_user_data, mock_goals_data, mock_entries_stats)
+    
+    response = client.get(
+        "/api/pdf/report",
+        headers={"Authorization": f"Bearer {test_user['token']}"}
+    )
+    
+    assert response.status_code == 200
+    assert response.content == b"%PDF-1.4 report"
+    assert response.headers["etag"].startswith('W/"')
+
+
+@patch('main.cache_pdf')
+@patch('main.get_cached_pdf', return_value=None)
+@patch('main.generate_goal_report_pdf', return_value=b"%PDF-1.4 report")
+@patch('main.get_user_time_stats', new_callable=AsyncMock)
+@patch('main.get_user_goals', new_callable=AsyncMock)
+@patch('main.get_user_data', new_callable=AsyncMock)
+def test_generate_full_report_not_modified(
+    mock_get_user, mock_get_goals, mock_get_stats, mock_generate_pdf, mock_get_cached, mock_cache,
+    test_user, mock_user_data, mock_goals_data, mock_entries_stats
+):
+    """Test a matching If-None-Match returns 304 without rendering the report"""
+    mock_report_sources(mock_get_user, mock_get_goals, mock_get_stats, mock_user_data, mock_goals_data, mock_entries_stats)
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    etag = client.get("/api/pdf/report", headers=headers).headers["etag"]
+    mock_generate_pdf.reset_mock()
+    mock_get_cached.reset_mock()
+    mock_cache.reset_mock()
+    
+    response = client.get("/api/pdf/report", headers={**headers, "If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    mock_generate_pdf.assert_not_called()
+    mock_get_cached.assert_not_called()
+    mock_cache.assert_not_called()
+
+
+@patch('main.cache_pdf')
+@patch('main.get_cached_pdf', return_value=None)
+@patch('main.generate_goal_report_pdf', return_value=b"%PDF-1.4 report")
+@patch('main.get_user_time_stats', new_callable=AsyncMock)
+@patch('main.get_user_goals', new_callable=AsyncMock)
+@patch('main.get_user_data', new_callable=AsyncMock)
+def test_generate_full_report_save_ignores_if_none_match(
+    mock_get_user, mock_get_goals, mock_get_stats, mock_generate_pdf, mock_get_cached, mock_cache,
+    test_user, mock_user_data, mock_goals_data, mock_entries_stats, tmp_path
+):
+    """Test save=true always returns the PDF so a copy is written to storage"""
+    mock_report_sources(mock_get_user, mock_get_goals, mock_get_stats, mock_user_data, mock_goals_data, mock_entries_stats)
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    etag = client.get("/api/pdf/report", headers=headers).headers["etag"]
+    
+    with patch('main.settings', replace(main.settings, PDF_STORAGE_PATH=str(tmp_path))):
+        response = client.get("/api/pdf/report?save=true", headers={**headers, "If-None-Match": etag})
+    
+    assert response.status_code == 200
+    assert response.content == b"%PDF-1.4 report"
+    assert [path.read_bytes() for path in tmp_path.glob("*.pdf")] == [b"%PDF-1.4 report"]
+
+
+# ============================================================================
+# PDF STORAGE CLEANUP TESTS
+# ============================================================================
+
+def test_remove_expired_pdfs(tmp_path):
+    """Test only saved PDFs older than the retention period are removed"""
+    expired = tmp_path / "expired.pdf"
+    fresh = tmp_path / "fresh.pdf"
+    other = tmp_path / "notes.txt"
+    for path in (expired, fresh, other):
+        path.write_bytes(b"data")
+    old_mtime = time.time() - 2 * 3600
+    os.utime(expired, (old_mtime, old_mtime))
+    os.utime(other, (old_mtime, old_mtime))
+    
+    with patch('main.settings', replace(main.settings, PDF_STORAGE_PATH=str(tmp_path))):
+        removed = main.remove_expired_pdfs(3600)
+    
+    assert removed == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["fresh.pdf", "notes.txt"]
+
+
+def test_remove_expired_pdfs_missing_directory(tmp_path):
+    """Test cleanup is a no-op when the storage directory does not exist"""
+    with patch('main.settings', replace(main.settings, PDF_STORAGE_PATH=str(tmp_path / "missing"))):
+        assert main.remove_expired_pdfs(3600) == 0
+
+
+@pytest.mark.parametrize("retention_minutes, cleanup_started", [(0, False), (60, True)])
+@patch('main.get_http_client')
+def test_startup_starts_storage_cleanup_only_with_retention(mock_get_client, retention_minutes, cleanup_started):
+    """Test PDF_STORAGE_RETENTION_MINUTES=0 turns the storage cleanup task off"""
+    with patch('main.settings', replace(main.settings, PDF_STORAGE_RETENTION_MINUTES=retention_minutes)), \
+         patch('main.asyncio.create_task', side_effect=lambda coro: coro.close()) as mock_create_task:
+        asyncio.run(main.startup_event())
+    
+    assert mock_create_task.called is cleanup_started
+
+
 # ============================================================================
 # STREAM FULL REPORT TESTS
 # ============================================================================
@@ -300,6 +429,24 @@ def test_stream_goal_report(
     assert response.headers["content-type"] == "application/pdf"
 
 
+@patch('main.build_goal_report', new_callable=AsyncMock)
+def test_stream_goal_report_larger_than_one_chunk(mock_build_report, test_user, test_goal_id):
+    """Test streaming a PDF that spans several chunks delivers every byte"""
+    pdf_bytes = b"%PDF-1.4\n" + os.urandom(PDF_STREAM_CHUNK_SIZE * 2 + 123)
+    mock_build_report.return_value = (pdf_bytes, {"title": "Big Goal"})
+    
+    response = client.get(
+        f"/api/pdf/goal/{test_goal_id}/stream",
+        headers={"Authorization": f"Bearer {test_user['token']}"}
+    )
+    
+    assert response.status_code == 200
+    assert response.content == pdf_bytes
+    chunks = list(iter_pdf_chunks(pdf_bytes))
+    assert len(chunks) == 3
+    assert all(type(chunk) is bytes for chunk in chunks)
+
+
 def test_stream_goal_report_unauthorized(test_goal_id):
     """Test streaming goal report without authentication"""
     response = client.get(f"/api/pdf/goal/{test_goal_id}/stream")
@@ -383,6 +530,32 @@ def test_generate_goal_specific_pdf_function(mock_fpdf_class, mock_user_data):
     mock_pdf.add_page.assert_called()
 
 
+def count_pdf_pages(pdf_bytes):
+    """Count the page objects in rendered PDF bytes"""
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf_bytes))
+
+
+def test_generate_goal_report_pdf_keeps_goals_together(mock_user_data, mock_entries_stats):
+    """Test goals that fit a page are moved to the next page rather than split"""
+    from pdf_generator import generate_goal_report_pdf
+    
+    goals = [
+        {"goal_id": str(uuid4()), "title": f"Goal {i}", "target_hours": 10.0, "description": "Short"}
+        for i in range(7)
+    ]
+    
+    assert count_pdf_pages(generate_goal_report_pdf(mock_user_data, goals, mock_entries_stats)) == 3
+
+
+def test_generate_goal_report_pdf_splits_oversized_goal_in_place(mock_user_data, mock_entries_stats):
+    """Test a goal taller than a page starts on the current page instead of being pushed to the next"""
+    from pdf_generator import generate_goal_report_pdf
+    
+    goals = [{"goal_id": str(uuid4()), "title": "Long title word " * 250, "target_hours": 10.0}]
+    
+    assert count_pdf_pages(generate_goal_report_pdf(mock_user_data, goals, mock_entries_stats)) == 2
+
+
 # ============================================================================
 # ERROR HANDLING AND EDGE CASES
 # ============================================================================
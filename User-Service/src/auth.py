@@ -1,18 +1,83 @@
 """Authentication module for JWT and Google OAuth"""
 
 import jwt
+import httpx
 import requests
+import threading
+import time
 import google.auth.transport.requests
 from google.oauth2 import id_token
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
-from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET
+from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, TOKEN_CACHE_TTL, USER_CACHE_TTL
 from database import User, get_db
+from schemas import UserResponse, user_to_response
 
 security = HTTPBearer()
 
+# get_current_user is a sync dependency and runs in the threadpool, so cache access is locked
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+# Profiles for read-only endpoints, keyed by google_sub; writes invalidate their entry
+_user_cache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client for Google's OAuth endpoints, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    """Close the shared Google OAuth client"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+GOOGLE_CERTS_CACHE_TTL = 3600
+
+_google_certs_cache = TTLCache(maxsize=4, ttl=GOOGLE_CERTS_CACHE_TTL)
+_google_certs_lock = threading.Lock()
+
+class CachedCertsRequest(google.auth.transport.requests.Request):
+    """
+    google-auth transport that keeps Google's signing certificates in memory.
+    id_token verification only issues GETs for the certificate endpoint, so successful
+    GET responses are reused for GOOGLE_CERTS_CACHE_TTL seconds over one pooled session.
+    """
+    def __call__(self, url, method="GET", **kwargs):
+        if method != "GET":
+            return super().__call__(url, method=method, **kwargs)
+        
+        with _google_certs_lock:
+            cached = _google_certs_cache.get(url)
+        if cached is not None:
+            return cached
+        
+        response = super().__call__(url, method=method, **kwargs)
+        if response.status == 200:
+            with _google_certs_lock:
+                _google_certs_cache[url] = response
+        return response
+
+_google_request = CachedCertsRequest(session=requests.Session())
+
 def create_access_token(user_id: str, expires_delta: timedelta | None = None) -> str:
     """Create JWT access token"""
     if expires_delta:
@@ -25,7 +90,17 @@ def create_access_token(user_id: str, expires_delta: timedelta | None = None) ->
     return encoded_jwt
 
 def verify_token(token: str) -> str:
-    """Verify JWT token and return user_id"""
+    """
+    Verify JWT token and return user_id
+    Decoded tokens are cached for TOKEN_CACHE_TTL seconds, never past their expiry
+    """
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at is None or time.time() < expires_at:
+            return user_id
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -35,6 +110,8 @@ def verify_token(token: str) -> str:
                 detail="Invalid token: missing user_id",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        with _token_cache_lock:
+            _token_cache[token] = (user_id, payload.get("exp"))
         return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -54,12 +131,12 @@ def verify_google_token(token: str) -> dict:
     try:
         idinfo = id_token.verify_oauth2_token(
             token,
-            google.auth.transport.requests.Request(),
+            _google_request,
             GOOGLE_CLIENT_ID,
             clock_skew_in_seconds=10
         )
         
-        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
+        if idinfo['iss'] not in GOOGLE_ISSUERS:
             raise ValueError('Wrong issuer.')
         
         return idinfo
@@ -69,11 +146,9 @@ def verify_google_token(token: str) -> dict:
             detail=f"Invalid Google token: {str(e)}"
         )
 
-def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
+async def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
     """Exchange authorization code for Google tokens (server-side OAuth)"""
     try:
-        token_url = "https://oauth2.googleapis.com/token"
-        
         payload = {
             "code": code,
             "client_id": GOOGLE_CLIENT_ID,
@@ -82,7 +157,7 @@ def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
             "grant_type": "authorization_code",
         }
         
-        response = requests.post(token_url, data=payload)
+        response = await get_http_client().post(GOOGLE_TOKEN_URL, data=payload)
         response.raise_for_status()
         
         token_data = response.json()
@@ -91,15 +166,20 @@ def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
         if not id_token_str:
             raise ValueError("No ID token in response")
         
-        idinfo = id_token.verify_oauth2_token(
+        # The token came straight from Google's token endpoint over TLS, so the signature
+        # check is skipped (OIDC Core 3.1.3.7); audience, issuer and expiry are still checked
+        idinfo = jwt.decode(
             id_token_str,
-            google.auth.transport.requests.Request(),
-            GOOGLE_CLIENT_ID,
-            clock_skew_in_seconds=10
+            options={"verify_signature": False, "verify_aud": True, "verify_exp": True},
+            audience=GOOGLE_CLIENT_ID,
+            leeway=10
         )
         
+        if idinfo.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError('Wrong issuer.')
+        
         return idinfo
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Failed to exchange code for token: {str(e)}"
@@ -110,6 +190,10 @@ def exchange_code_for_token(code: str, redirect_uri: str) -> dict:
             detail=f"Invalid authorization code: {str(e)}"
         )
 
+def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    """Get current authenticated user's ID without loading the user"""
+    return verify_token(credentials.credentials)
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -118,10 +202,41 @@ def get_current_user(
     token = credentials.credentials
     user_id = verify_token(token)
     
-    user = db.query(User).filter(User.google_sub == user_id).first()
+    user = db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     return user
+
+def get_current_user_response(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> UserResponse:
+    """
+    Get current authenticated user's profile for read-only endpoints
+    Profiles are cached for USER_CACHE_TTL seconds; endpoints that modify the user use get_current_user
+    """
+    user_id = verify_token(credentials.credentials)
+    
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    
+    user = db.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    profile = user_to_response(user)
+    with _user_cache_lock:
+        _user_cache[user_id] = profile
+    return profile
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user's cached profile after it was updated or deleted"""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
@@ -5,7 +5,8 @@ from dotenv import load_dotenv
 
 ENV = os.getenv("ENV", "prod")
 
-if ENV == "dev" or ENV == "prod":
+# In prod the environment normally provides the secrets; the .env baked into the image is the fallback
+if (ENV == "dev" or (ENV == "prod" and not os.getenv("SECRET_KEY"))) and os.path.isfile(".env"):
     load_dotenv(".env")
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -14,9 +15,15 @@ DB_PORT = int(os.getenv("DB_PORT", "5432"))
 POSTGRES_USER = os.getenv("POSTGRES_USER")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 POSTGRES_DB = os.getenv("POSTGRES_DB")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "30"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", None)  
 HOST = os.getenv("HOST", "0.0.0.0")
@@ -1,18 +1,27 @@
 """Database configuration and models"""
 
-from sqlalchemy import create_engine, Column, String, DateTime, Text
+from sqlalchemy import create_engine, Column, String, DateTime, Text, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import declarative_base, sessionmaker
-from datetime import datetime, timezone
 import uuid
-from config import DATABASE_URL
+from config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sized for bursts of concurrent logins; stale connections are detected before use
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch updated_at with RETURNING during the flush instead of expiring it
+    __mapper_args__ = {"eager_defaults": True}
 
     google_sub = Column(Text, primary_key=True) 
     google_email = Column(Text, nullable=False)  
@@ -22,8 +31,8 @@ class User(Base):
     phone = Column(Text, nullable=True)
     currency = Column(Text, nullable=True)  
     timezone = Column(Text, nullable=True)  
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default="now()")
-    updated_at = Column(DateTime(timezone=True), nullable=False, server_default="now()", onupdate=datetime.now)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
 def get_db():
     """Database dependency for FastAPI"""
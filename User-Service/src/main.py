@@ -6,11 +6,14 @@ A FastAPI based user management service with Google OAuth and JWT authentication
 from fastapi import FastAPI, HTTPException, Depends, status, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime, timezone
-import traceback
+from cachetools import TTLCache
+import asyncio
 import os
+import threading
 
 from config import (
     CORS_ORIGINS,
@@ -29,7 +32,12 @@ from auth import (
     verify_token,
     verify_google_token,
     exchange_code_for_token,
-    get_current_user
+    get_current_user,
+    get_current_user_id,
+    get_current_user_response,
+    invalidate_cached_user,
+    get_http_client,
+    close_http_client
 )
 
 from schemas import (
@@ -41,7 +49,8 @@ from schemas import (
     GoogleCallbackRequest,
     TokenVerifyResponse,
     HealthResponse,
-    DeleteResponse
+    DeleteResponse,
+    user_to_response
 )
 
 # Check if the application is running in a test environment
@@ -102,6 +111,13 @@ app.add_middleware(
     max_age=600,
 )
 
+# Unhandled errors are answered by Starlette outside CORSMiddleware, so these headers are added by hand
+ERROR_CORS_HEADERS = {
+    "Access-Control-Allow-Credentials": "true",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
+    "Access-Control-Allow-Headers": "*",
+}
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions and ensure CORS headers are present"""
@@ -109,14 +125,30 @@ async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
-        headers={
-            "Access-Control-Allow-Origin": request.headers.get("origin", "*"),
-            "Access-Control-Allow-Credentials": "true",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
-            "Access-Control-Allow-Headers": "*",
-        }
+        headers={**ERROR_CORS_HEADERS, "Access-Control-Allow-Origin": request.headers.get("origin", "*")}
     )
 
+# Pages of GET /api/users keyed by (skip, limit); any change to the users table clears them all
+USERS_LIST_CACHE_TTL = 5
+
+_users_list_cache = TTLCache(maxsize=64, ttl=USERS_LIST_CACHE_TTL)
+_users_list_lock = threading.Lock()
+
+def invalidate_users_list() -> None:
+    """Drop every cached page of the user list"""
+    with _users_list_lock:
+        _users_list_cache.clear()
+
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared Google OAuth client so the first callback does not pay for its TLS setup"""
+    get_http_client()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared Google OAuth client on application shutdown"""
+    await close_http_client()
+
 # ============================================================================
 # HEALTH CHECK ENDPOINTS
 # ============================================================================
@@ -128,33 +160,82 @@ async def health_check():
     """
     return HealthResponse(status="healthy")
 
-@app.get("/api/users/health/readiness")
-async def readiness():
+@app.get("/api/users/health/readiness", response_model=HealthResponse, tags=["Health"])
+def readiness(db: Session = Depends(get_db)):
     """
     Readiness health check. Confirms the service actually works.
     """
     try:
-        db = next(get_db())
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
     except SQLAlchemyError:
-        return HealthResponse(status="unhealthy"), 503
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unhealthy"}
+        )
     return HealthResponse(status="healthy")
 
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
 # ============================================================================
 
-@app.options("/api/auth/google/callback")
-async def options_google_auth(request: Request):
-    """Handle CORS preflight for Google auth endpoint"""
-    return Response(
-        status_code=204,
-        headers={
-            "Access-Control-Allow-Origin": request.headers.get("origin", "*"),
-            "Access-Control-Allow-Methods": "POST, OPTIONS",
-            "Access-Control-Allow-Headers": "content-type, authorization",
-            "Access-Control-Allow-Credentials": "true",
-        }
+def get_or_create_google_user(db: Session, google_info: dict) -> tuple[User, bool]:
+    """
+    Return the user for a verified Google identity, registering them on first login.
+    The second value is True when the user was just created.
+    """
+    google_sub = google_info.get('sub')
+    email = google_info.get('email')
+    
+    user = db.get(User, google_sub)
+    if user is not None:
+        return user, False
+    
+    given_name = google_info.get('given_name', '')
+    family_name = google_info.get('family_name', '')
+    if not given_name and not family_name:
+        full_name = google_info.get('name', email.split('@')[0])
+    else:
+        full_name = f"{given_name} {family_name}".strip() or email.split('@')[0]
+    
+    # One statement inserts the user and returns the row; a concurrent first login loses cleanly
+    user = db.scalars(
+        insert(User)
+        .values(
+            google_sub=google_sub,
+            google_email=email,
+            full_name=full_name
+        )
+        .on_conflict_do_nothing(index_elements=[User.google_sub])
+        .returning(User)
+    ).first()
+    is_new_user = user is not None
+    if not is_new_user:
+        user = db.get(User, google_sub)
+    db.commit()
+    if is_new_user:
+        invalidate_users_list()
+    return user, is_new_user
+
+def login_response(user: User, is_new_user: bool, response: Response) -> TokenResponse:
+    """
+    Issue a JWT for the user, setting it as a cookie and the status code on the response.
+    The returned TokenResponse is serialized by the endpoint's response_model.
+    """
+    access_token = create_access_token(str(user.google_sub))
+    
+    response.status_code = status.HTTP_201_CREATED if is_new_user else status.HTTP_200_OK
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        domain=".zusidelavi.com",
+        httponly=True,
+        secure=True,
+        samesite="none"
+    )
+    return TokenResponse(
+        access_token=access_token,
+        token_type="bearer",
+        user=user_to_response(user)
     )
 
 @app.post(
@@ -189,7 +270,7 @@ async def options_google_auth(request: Request):
         401: {"description": "Invalid Google token"}
     }
 )
-async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db)):
+async def google_auth(request: GoogleAuthRequest, response: Response, db: Session = Depends(get_db)):
     """
     Authenticate with Google ID token (client-side flow).
     
@@ -220,7 +301,7 @@ async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db))
     **No Authentication Required**: This is the login endpoint.
     """
     try:
-        google_info = verify_google_token(request.token)
+        google_info = await asyncio.to_thread(verify_google_token, request.token)
         email = google_info.get('email')
         google_sub = google_info.get("sub")
         
@@ -235,58 +316,8 @@ async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db))
             detail=f"Invalid Google token: {str(e)}"
         )
     
-    user = db.query(User).filter(User.google_sub == google_sub).first()
-    is_new_user = user is None
-    
-    if is_new_user:
-        given_name = google_info.get('given_name', '')
-        family_name = google_info.get('family_name', '')
-        if not given_name and not family_name:
-            full_name = google_info.get('name', email.split('@')[0])
-        else:
-            full_name = f"{given_name} {family_name}".strip() or email.split('@')[0]
-        
-        user = User(
-            google_sub=google_sub,
-            google_email=email,
-            full_name=full_name,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-    access_token = create_access_token(str(user.google_sub))
-    
-    response = JSONResponse(
-        status_code=status.HTTP_201_CREATED if is_new_user else status.HTTP_200_OK,
-        content={
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "google_sub": user.google_sub,
-                "google_email": user.google_email,
-                "full_name": user.full_name,
-                "address": user.address,
-                "country": user.country,
-                "phone": user.phone,
-                "currency": user.currency,
-                "timezone": user.timezone,
-                "created_at": user.created_at.isoformat(),
-                "updated_at": user.updated_at.isoformat()
-            }
-        }
-    )
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        domain=".zusidelavi.com",
-        httponly=True,
-        secure=True,
-        samesite="none"
-    )
-    return response
+    user, is_new_user = await asyncio.to_thread(get_or_create_google_user, db, google_info)
+    return login_response(user, is_new_user, response)
 
 @app.post(
     "/api/auth/google/callback",
@@ -305,7 +336,7 @@ async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db))
         401: {"description": "Invalid authorization code"}
     }
 )
-async def google_callback(request: GoogleCallbackRequest, db: Session = Depends(get_db)):
+async def google_callback(request: GoogleCallbackRequest, response: Response, db: Session = Depends(get_db)):
     """
     Handle Google OAuth callback (server-side authorization code flow).
     
@@ -339,7 +370,7 @@ async def google_callback(request: GoogleCallbackRequest, db: Session = Depends(
     
     **No Authentication Required**: This is the OAuth callback endpoint.
     """
-    google_info = exchange_code_for_token(request.code, request.redirect_uri)
+    google_info = await exchange_code_for_token(request.code, request.redirect_uri)
     email = google_info.get('email')
     google_sub = google_info.get('sub')
     
@@ -349,58 +380,8 @@ async def google_callback(request: GoogleCallbackRequest, db: Session = Depends(
             detail="Email or sub not found in Google token"
         )
     
-    user = db.query(User).filter(User.google_sub == google_sub).first()
-    is_new_user = user is None
-    
-    if is_new_user:
-        given_name = google_info.get('given_name', '')
-        family_name = google_info.get('family_name', '')
-        if not given_name and not family_name:
-            full_name = google_info.get('name', email.split('@')[0])
-        else:
-            full_name = f"{given_name} {family_name}".strip() or email.split('@')[0]
-        
-        user = User(
-            google_sub=google_sub,
-            google_email=email,
-            full_name=full_name,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-    access_token = create_access_token(str(user.google_sub))
-    
-    response = JSONResponse(
-        status_code=status.HTTP_201_CREATED if is_new_user else status.HTTP_200_OK,
-        content={
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "google_sub": user.google_sub,
-                "google_email": user.google_email,
-                "full_name": user.full_name,
-                "address": user.address,
-                "country": user.country,
-                "phone": user.phone,
-                "currency": user.currency,
-                "timezone": user.timezone,
-                "created_at": user.created_at.isoformat(),
-                "updated_at": user.updated_at.isoformat()
-            }
-        }
-    )
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        domain=".zusidelavi.com",
-        httponly=True,
-        secure=True,
-        samesite="none"
-    )
-    return response
+    user, is_new_user = await asyncio.to_thread(get_or_create_google_user, db, google_info)
+    return login_response(user, is_new_user, response)
 
 @app.get(
     "/api/auth/verify",
@@ -423,7 +404,7 @@ async def google_callback(request: GoogleCallbackRequest, db: Session = Depends(
         401: {"description": "Invalid or expired token"}
     }
 )
-async def verify_jwt_token(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def verify_jwt_token(current_user: UserResponse = Depends(get_current_user_response)):
     """
     Verify if a JWT token is valid and not expired.
     
@@ -479,7 +460,7 @@ async def verify_jwt_token(db: Session = Depends(get_db), current_user: User = D
         401: {"description": "Unauthorized - invalid or missing token"}
     }
 )
-async def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: UserResponse = Depends(get_current_user_response)):
     """
     Get the complete profile of the currently authenticated user.
     
@@ -503,7 +484,7 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
     
     **Authentication**: Required (Bearer token)
     """
-    return UserResponse.model_validate(current_user)
+    return current_user
 
 @app.get(
     "/api/users/{user_id}",
@@ -517,10 +498,10 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
         404: {"description": "User not found"}
     }
 )
-async def get_user(
+def get_user(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user_response)
 ):
     """
     Get any user's profile by their user ID (Google sub).
@@ -540,7 +521,7 @@ async def get_user(
     
     **Authentication**: Required (Bearer token)
     """
-    user = db.query(User).filter(User.google_sub == user_id).first()
+    user = db.get(User, user_id)
     
     if user is None:
         raise HTTPException(
@@ -548,7 +529,7 @@ async def get_user(
             detail="User not found"
         )
     
-    return UserResponse.model_validate(user)
+    return user_to_response(user)
 
 @app.get(
     "/api/users",
@@ -579,11 +560,11 @@ async def get_user(
         401: {"description": "Unauthorized"}
     }
 )
-async def get_all_users(
+def get_all_users(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Maximum records to return (1-100)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user_response)
 ):
     """
     Get a paginated list of all users in the system.
@@ -605,8 +586,33 @@ async def get_all_users(
     
     **Authentication**: Required (Bearer token)
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return [UserResponse.model_validate(user) for user in users]
+    key = (skip, limit)
+    with _users_list_lock:
+        cached = _users_list_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    # Plain column rows skip ORM instance state and identity-map bookkeeping
+    rows = db.execute(
+        select(
+            User.google_sub,
+            User.google_email,
+            User.full_name,
+            User.address,
+            User.country,
+            User.phone,
+            User.currency,
+            User.timezone,
+            User.created_at,
+            User.updated_at
+        )
+        .offset(skip)
+        .limit(limit)
+    ).all()
+    users = [UserResponse.model_construct(**row._mapping) for row in rows]
+    with _users_list_lock:
+        _users_list_cache[key] = users
+    return users
 
 @app.put(
     "/api/users/me",
@@ -621,7 +627,7 @@ async def get_all_users(
         401: {"description": "Unauthorized"}
     }
 )
-async def update_user_profile(
+def update_user_profile(
     user_update: UserUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -630,6 +636,7 @@ async def update_user_profile(
     Update the profile of the currently authenticated user.
     
     **Partial Updates**: All fields are optional. Only provided fields will be updated.
+    Sending `null` clears an optional field; `full_name` cannot be cleared.
     
     **Updatable Fields**:
     - `full_name`: User's full name
@@ -655,25 +662,14 @@ async def update_user_profile(
     
     **Authentication**: Required (Bearer token)
     """
-    if user_update.full_name is not None:
-        current_user.full_name = user_update.full_name
-    if user_update.address is not None:
-        current_user.address = user_update.address
-    if user_update.country is not None:
-        current_user.country = user_update.country
-    if user_update.phone is not None:
-        current_user.phone = user_update.phone
-    if user_update.currency is not None:
-        current_user.currency = user_update.currency
-    if user_update.timezone is not None:
-        current_user.timezone = user_update.timezone
-    
-    current_user.updated_at = datetime.now(timezone.utc)
+    for field, value in user_update.model_dump(exclude_unset=True).items():
+        setattr(current_user, field, value)
     
     db.commit()
-    db.refresh(current_user)
+    invalidate_cached_user(current_user.google_sub)
+    invalidate_users_list()
     
-    return UserResponse.model_validate(current_user)
+    return user_to_response(current_user)
 
 @app.delete(
     "/api/users/me",
@@ -695,9 +691,9 @@ async def update_user_profile(
         401: {"description": "Unauthorized"}
     }
 )
-async def delete_current_user(
+def delete_current_user(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    user_id: str = Depends(get_current_user_id)
 ):
     """
     Permanently delete the currently authenticated user account.
@@ -726,8 +722,16 @@ async def delete_current_user(
     
     **Authentication**: Required (Bearer token)
     """
-    db.delete(current_user)
+    # A single DELETE by primary key; the row never needs to be loaded
+    result = db.execute(delete(User).where(User.google_sub == user_id))
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
     db.commit()
+    invalidate_cached_user(user_id)
+    invalidate_users_list()
     return DeleteResponse(message="User deleted successfully")
 
 if __name__ == "__main__":
@@ -736,5 +740,7 @@ if __name__ == "__main__":
         app,
         host=HOST,
         port=PORT,
-        reload=DEBUG
+        reload=DEBUG,
+        loop="uvloop",
+        http="httptools"
     )
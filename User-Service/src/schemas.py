@@ -1,6 +1,6 @@
 """Pydantic schemas for request/response validation"""
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime
 from typing import Optional
 
@@ -36,6 +36,14 @@ class UserUpdate(BaseModel):
     currency: Optional[str] = None
     timezone: Optional[str] = None
 
+    @field_validator('full_name')
+    @classmethod
+    def full_name_not_null(cls, v: Optional[str]) -> str:
+        """Reject an explicit null, since every user must keep a name"""
+        if v is None:
+            raise ValueError("full_name cannot be null")
+        return v
+
     class Config:
         extra = "forbid"  
         json_schema_extra = {
@@ -64,6 +72,26 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True
+        # Cached instances are shared between requests
+        frozen = True
+
+def user_to_response(user) -> UserResponse:
+    """
+    Build the response model for a user loaded from the database.
+    Rows already satisfy the schema, so validation is skipped.
+    """
+    return UserResponse.model_construct(
+        google_sub=user.google_sub,
+        google_email=user.google_email,
+        full_name=user.full_name,
+        address=user.address,
+        country=user.country,
+        phone=user.phone,
+        currency=user.currency,
+        timezone=user.timezone,
+        created_at=user.created_at,
+        updated_at=user.updated_at
+    )
 
 class TokenResponse(BaseModel):
     """Schema for authentication token response"""
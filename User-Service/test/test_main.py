@@ -4,8 +4,9 @@ Comprehensive Unit and Integration Tests for User-Service
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone
 import sys
@@ -16,15 +17,26 @@ os.environ["TEST_ENV"] = "true"
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from main import app, get_db
+from main import app, get_db, invalidate_users_list
 from database import Base, User
-from auth import create_access_token
+from auth import create_access_token, _user_cache
 
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool  # One connection, so every thread sees the same in-memory database
 )
+
+# pysqlite manages transactions itself and breaks SAVEPOINT; let SQLAlchemy emit BEGIN instead
+@event.listens_for(engine, "connect")
+def disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def begin_sqlite_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base.metadata.create_all(bind=engine)
@@ -39,25 +51,42 @@ def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
+# Read once; every test re-runs the same script
+with open(os.path.join(os.path.dirname(__file__), '../../Database/user_test.sql'), 'r') as file:
+    INIT_SQL = file.read()
+
 client = TestClient(app)
 
 
+def run_init_sql():
+    """Run init.sql to create the database schema"""
+    with engine.begin() as connection:
+        connection.execute(text(INIT_SQL))
+
+
+run_init_sql()  # Run the init.sql script
+
+
 @pytest.fixture(autouse=True)
 def reset_db():
-    """Reset database before each test"""
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    run_init_sql()  # Run the init.sql script
+    """Run each test inside a transaction that is rolled back afterwards"""
+    _user_cache.clear()
+    invalidate_users_list()
+    connection = engine.connect()
+    trans = connection.begin()
+    # Commits made by the app and fixtures only release a SAVEPOINT inside this transaction
+    TestingSessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
     yield
-    Base.metadata.drop_all(bind=engine)
+    trans.rollback()
+    connection.close()
 
 
-def run_init_sql():
-    """Run init.sql to create the database schema"""
-    with engine.connect() as connection:
-        with open(os.path.join(os.path.dirname(__file__), '../../Database/user_test.sql'), 'r') as file:
-            sql_script = file.read()
-            connection.execute(text(sql_script))
+@pytest.fixture
+def google_mock(monkeypatch):
+    """Replace Google ID token verification where main looks it up"""
+    mock = MagicMock()
+    monkeypatch.setattr('main.verify_google_token', mock)
+    return mock
 
 
 @pytest.fixture
@@ -106,10 +135,9 @@ def test_readiness_health_check():
 # AUTHENTICATION TESTS
 # ============================================================================
 
-@patch('auth.verify_google_token')
-def test_google_auth_new_user(mock_verify):
+def test_google_auth_new_user(google_mock):
     """Test Google authentication with new user registration"""
-    mock_verify.return_value = {
+    google_mock.return_value = {
         'sub': 'google_new_user_123',
         'email': 'newuser@gmail.com',
         'given_name': 'New',
@@ -130,10 +158,9 @@ def test_google_auth_new_user(mock_verify):
     assert data["user"]["full_name"] == "New User"
 
 
-@patch('auth.verify_google_token')
-def test_google_auth_existing_user(mock_verify, test_user):
+def test_google_auth_existing_user(google_mock, test_user):
     """Test Google authentication with existing user"""
-    mock_verify.return_value = {
+    google_mock.return_value = {
         'sub': test_user['user'].google_sub,
         'email': test_user['user'].google_email,
         'given_name': 'Test',
@@ -152,10 +179,9 @@ def test_google_auth_existing_user(mock_verify, test_user):
     assert data["user"]["google_email"] == test_user['user'].google_email
 
 
-@patch('auth.verify_google_token')
-def test_google_auth_missing_email(mock_verify):
+def test_google_auth_missing_email(google_mock):
     """Test Google authentication fails when email is missing"""
-    mock_verify.return_value = {
+    google_mock.return_value = {
         'sub': 'google_123',
     }
     
@@ -168,10 +194,9 @@ def test_google_auth_missing_email(mock_verify):
     assert "Email not found" in response.json()["detail"]
 
 
-@patch('auth.verify_google_token')
-def test_google_auth_invalid_token(mock_verify):
+def test_google_auth_invalid_token(google_mock):
     """Test Google authentication with invalid token"""
-    mock_verify.side_effect = Exception("Invalid token")
+    google_mock.side_effect = Exception("Invalid token")
     
     response = client.post(
         "/api/auth/google",
@@ -383,6 +408,31 @@ def test_update_user_profile_partial(test_user):
     assert data["full_name"] == test_user['user'].full_name
 
 
+def test_update_user_profile_clear_optional_field(test_user):
+    """Test that an explicit null clears an optional field"""
+    response = client.put(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {test_user['token']}"},
+        json={"phone": None}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["phone"] is None
+    assert data["address"] == test_user['user'].address
+
+
+def test_update_user_profile_null_full_name(test_user):
+    """Test that full_name cannot be cleared"""
+    response = client.put(
+        "/api/users/me",
+        headers={"Authorization": f"Bearer {test_user['token']}"},
+        json={"full_name": None}
+    )
+    
+    assert response.status_code == 422
+
+
 def test_update_user_profile_without_auth():
     """Test updating user profile without authentication"""
     response = client.put(
@@ -416,6 +466,34 @@ def test_update_user_profile_invalid_field():
     assert response.status_code == 422
 
 
+def test_update_user_profile_refreshes_cached_profile(test_user):
+    """Test that GET /api/users/me returns the new value after an update"""
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    before = client.get("/api/users/me", headers=headers)
+    assert before.json()["full_name"] == "Test User"
+    
+    response = client.put("/api/users/me", headers=headers, json={"full_name": "Cached Name"})
+    assert response.status_code == 200
+    
+    after = client.get("/api/users/me", headers=headers)
+    assert after.status_code == 200
+    assert after.json()["full_name"] == "Cached Name"
+
+
+def test_update_user_profile_refreshes_users_list(test_user):
+    """Test that a cached /api/users page shows the new value after an update"""
+    headers = {"Authorization": f"Bearer {test_user['token']}"}
+    before = client.get("/api/users?skip=0&limit=10", headers=headers)
+    assert [user["full_name"] for user in before.json()] == ["Test User"]
+    
+    response = client.put("/api/users/me", headers=headers, json={"full_name": "Listed Name"})
+    assert response.status_code == 200
+    
+    after = client.get("/api/users?skip=0&limit=10", headers=headers)
+    assert after.status_code == 200
+    assert [user["full_name"] for user in after.json()] == ["Listed Name"]
+
+
 # ============================================================================
 # USER DELETE TESTS
 # ============================================================================
@@ -486,59 +564,35 @@ def test_options_google_auth():
 # EDGE CASES AND ERROR HANDLING
 # ============================================================================
 
-def test_create_user_with_minimal_google_info():
-    """Test user creation when Google provides minimal information"""
-    with patch('auth.verify_google_token') as mock_verify:
-        mock_verify.return_value = {
-            'sub': 'google_minimal_123',
-            'email': 'minimal@gmail.com',
-            'name': 'Minimal User'
-        }
-        
-        response = client.post(
-            "/api/auth/google",
-            json={"token": "mock_token"}
-        )
-        
-        assert response.status_code == 201
-        data = response.json()
-        assert data["user"]["full_name"] == "Minimal User"
-
-
-def test_create_user_with_no_name_info():
-    """Test user creation when Google provides no name information"""
-    with patch('auth.verify_google_token') as mock_verify:
-        mock_verify.return_value = {
-            'sub': 'google_no_name_123',
-            'email': 'noname@gmail.com'
-        }
-        
-        response = client.post(
-            "/api/auth/google",
-            json={"token": "mock_token"}
-        )
-        
-        assert response.status_code == 201
-        data = response.json()
-        assert data["user"]["full_name"] == "noname"
-
-
-def test_invalid_pagination_parameters(test_user):
-    """Test pagination with invalid parameters"""
-    response = client.get(
-        "/api/users?skip=-1&limit=10",
-        headers={"Authorization": f"Bearer {test_user['token']}"}
-    )
-    assert response.status_code == 422
+@pytest.mark.parametrize("google_info,expected_name", [
+    (
+        {'sub': 'google_minimal_123', 'email': 'minimal@gmail.com', 'name': 'Minimal User'},
+        "Minimal User"
+    ),
+    (
+        {'sub': 'google_no_name_123', 'email': 'noname@gmail.com'},
+        "noname"
+    ),
+], ids=["minimal_info", "no_name_info"])
+def test_create_user_with_partial_google_info(google_mock, google_info, expected_name):
+    """Test user creation when Google provides minimal or no name information"""
+    google_mock.return_value = google_info
     
-    response = client.get(
-        "/api/users?skip=0&limit=1000",
-        headers={"Authorization": f"Bearer {test_user['token']}"}
+    response = client.post(
+        "/api/auth/google",
+        json={"token": "mock_token"}
     )
-    assert response.status_code == 422
     
+    assert response.status_code == 201
+    data = response.json()
+    assert data["user"]["full_name"] == expected_name
+
+
+@pytest.mark.parametrize("skip,limit", [(-1, 10), (0, 1000), (0, 0)])
+def test_invalid_pagination_parameters(test_user, skip, limit):
+    """Test pagination with invalid parameters"""
     response = client.get(
-        "/api/users?skip=0&limit=0",
+        f"/api/users?skip={skip}&limit={limit}",
         headers={"Authorization": f"Bearer {test_user['token']}"}
     )
     assert response.status_code == 422